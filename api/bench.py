@@ -0,0 +1,337 @@
+"""
+bench.py — Benchmark suite for the API package.
+
+Commands:
+    python bench.py startup [--budget-ms 600]   import-time profile of index.py (cold start)
+    python bench.py variance [--round 5]        standard error / latency per variance-reduction mode
+    python bench.py analytic [--iters 200000]   cross-check analytic mode against Monte Carlo
+    python bench.py upstream [--latency-ms 300] Jolpica fetch + endpoint latency against jolpica_stub.py
+"""
+
+import os
+import re
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+from typing import Any, Dict, List, Tuple
+
+_api_dir = os.path.dirname(os.path.abspath(__file__))
+if _api_dir not in sys.path:
+    sys.path.insert(0, _api_dir)
+
+# Modules that must stay off the static-endpoint startup path
+HEAVY_MODULES = ("numpy", "httpx", "monte_carlo", "ratings", "jolpica", "outcome_store")
+
+
+# ──────────────────────────────────────────────
+#  Startup / import time
+# ──────────────────────────────────────────────
+def _importtime(module: str) -> List[Tuple[str, int, int]]:
+    """Run `python -X importtime -c 'import <module>'` fresh; returns (name, self_us, cumulative_us)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_api_dir, capture_output=True, text=True, check=True,
+        env={**os.environ, "F1_WARMUP": "0"},
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2))))
+    return rows
+
+
+_FIRST_REQUEST_SCRIPT = """
+import sys, time, asyncio
+t0 = time.perf_counter()
+import index
+t1 = time.perf_counter()
+
+async def call(path):
+    # Bare ASGI call so the probe itself does not import an HTTP client
+    scope = {"type": "http", "method": "GET", "path": path, "raw_path": path.encode(),
+             "query_string": b"", "headers": [], "http_version": "1.1", "scheme": "http",
+             "server": ("bench", 80), "client": ("bench", 1), "root_path": ""}
+    sent = []
+    requested = False
+    async def receive():
+        nonlocal requested
+        if requested:
+            await asyncio.Event().wait()  # no disconnect while the response is produced
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        sent.append(message)
+    await index.app(scope, receive, send)
+    return sent[0]["status"]
+
+status = asyncio.run(call(sys.argv[1]))
+t2 = time.perf_counter()
+heavy = [m for m in sys.argv[2:] if m in sys.modules]
+print(status, (t1 - t0) * 1000, (t2 - t1) * 1000, ",".join(heavy) or "-")
+"""
+
+
+def _first_request_ms(path: str) -> Dict[str, Any]:
+    """Cold process: import the app, then time one request in-process."""
+    proc = subprocess.run(
+        [sys.executable, "-c", _FIRST_REQUEST_SCRIPT, path, *HEAVY_MODULES],
+        cwd=_api_dir, capture_output=True, text=True, check=True,
+        env={**os.environ, "F1_WARMUP": "0"},
+    )
+    status, import_ms, request_ms, heavy = proc.stdout.split()
+    return {
+        "status": int(status),
+        "import_ms": float(import_ms),
+        "request_ms": float(request_ms),
+        "heavy_loaded": [] if heavy == "-" else heavy.split(","),
+    }
+
+
+def bench_startup(args: argparse.Namespace) -> int:
+    rows = _importtime("index")
+    total_us = next(cum for name, _, cum in reversed(rows) if name == "index")
+    top_level = sorted(
+        ((name, cum) for name, _, cum in rows if "." not in name),
+        key=lambda r: -r[1],
+    )[:args.top]
+
+    print(f"index import: {total_us / 1000:.1f} ms (budget {args.budget_ms} ms)")
+    for name, cum in top_level:
+        print(f"  {cum / 1000:8.1f} ms  {name}")
+
+    failures = []
+    loaded_heavy = sorted({name for name, _, _ in rows} & set(HEAVY_MODULES))
+    if loaded_heavy:
+        failures.append(f"heavy modules imported at startup: {', '.join(loaded_heavy)}")
+    if total_us / 1000 > args.budget_ms:
+        failures.append(f"import time {total_us / 1000:.1f} ms exceeds budget {args.budget_ms} ms")
+
+    for path in ("/api/health", "/api/circuits"):
+        r = _first_request_ms(path)
+        print(f"{path}: HTTP {r['status']}, import {r['import_ms']:.1f} ms, first request {r['request_ms']:.1f} ms")
+        if r["heavy_loaded"]:
+            failures.append(f"{path} loaded {', '.join(r['heavy_loaded'])}")
+
+    for msg in failures:
+        print(f"FAIL: {msg}")
+    return 1 if failures else 0
+
+
+# ──────────────────────────────────────────────
+#  Variance reduction
+# ──────────────────────────────────────────────
+def bench_variance(args: argparse.Namespace) -> int:
+    """
+    Mean standard error of win % across drivers for each mode, plus the
+    iterations plain sampling would need to match it (SE scales as 1/sqrt(n)).
+    """
+    import numpy as np
+    from monte_carlo import run_race_simulation, VARIANCE_REDUCTION_MODES
+
+    baseline_se = None
+    print(f"round {args.round}, {args.iters} iterations, {args.repeats} repeats")
+    print(f"{'mode':<16}{'iters':>8}{'ms':>9}{'win SE':>9}{'podium SE':>11}{'plain-equiv iters':>19}")
+    for mode in VARIANCE_REDUCTION_MODES:
+        try:
+            run_race_simulation(args.round, 200, variance_reduction=mode)  # warm caches
+        except ValueError as exc:
+            print(f"{mode:<16}skipped: {exc}")
+            continue
+        times, win_se, podium_se = [], [], []
+        for rep in range(args.repeats):
+            t0 = time.perf_counter()
+            r = run_race_simulation(args.round, args.iters, seed=rep, variance_reduction=mode)
+            times.append((time.perf_counter() - t0) * 1000)
+            win_se.append(np.mean([d["win_se"] for d in r["results"]]))
+            podium_se.append(np.mean([d["podium_se"] for d in r["results"]]))
+        se = float(np.mean(win_se))
+        if baseline_se is None:
+            baseline_se, baseline_iters = se, r["iterations"]
+        equiv = baseline_iters * (baseline_se / se) ** 2
+        print(f"{mode:<16}{r['iterations']:>8}{np.median(times):>9.1f}{se:>9.3f}{np.mean(podium_se):>11.3f}{equiv:>19.0f}")
+    return 0
+
+
+# ──────────────────────────────────────────────
+#  Analytic mode cross-check
+# ──────────────────────────────────────────────
+def bench_analytic(args: argparse.Namespace) -> int:
+    """
+    Compare run_race_analytic with a large seeded Monte Carlo run on every
+    round; fails if any win/podium % differs by more than --max-se standard errors.
+    """
+    import numpy as np
+    from data import CIRCUITS
+    from monte_carlo import run_race_simulation, run_race_analytic
+
+    failures = 0
+    worst_h2h = 0.0
+    for circuit in CIRCUITS:
+        rnd = circuit["round"]
+        t0 = time.perf_counter()
+        exact = run_race_analytic(rnd, h2h=True)
+        exact_ms = (time.perf_counter() - t0) * 1000
+        sim = run_race_simulation(rnd, args.iters, seed=rnd, h2h=True)
+
+        mc = {r["code"]: r for r in sim["results"]}
+        worst = 0.0
+        for r in exact["results"]:
+            m = mc[r["code"]]
+            for key, se_key in (("win_pct", "win_se"), ("podium_pct", "podium_se")):
+                z = abs(r[key] - m[key]) / max(m[se_key], 0.01)
+                worst = max(worst, z)
+        h2h_diff = float(np.max(np.abs(np.array(exact["h2h"]["matrix"]) - np.array(sim["h2h"]["matrix"]))))
+        worst_h2h = max(worst_h2h, h2h_diff)
+        status = "ok" if worst <= args.max_se else "FAIL"
+        failures += status == "FAIL"
+        print(f"round {rnd:>2} {circuit['name']:<15} analytic {exact_ms:6.1f} ms  worst |diff| {worst:4.1f} SE  {status}")
+
+    print(f"max head-to-head |diff|: {worst_h2h:.2f} pp")
+    return 1 if failures else 0
+
+
+# ──────────────────────────────────────────────
+#  Upstream (Jolpica stand-in)
+# ──────────────────────────────────────────────
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_stub(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    """Launch jolpica_stub.py on a free port; returns (process, base URL) once it answers."""
+    import httpx
+
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "jolpica_stub.py", "serve", "--port", str(port),
+         "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+         "--error-rate", str(args.error_rate), "--hang-rate", str(args.hang_rate)],
+        cwd=_api_dir,
+    )
+    root = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            httpx.get(f"{root}/_stub/config", timeout=0.5)
+            return proc, f"{root}/ergast/f1"
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise SystemExit("jolpica_stub.py did not start")
+
+
+def _percentiles(samples_ms: List[float]) -> str:
+    import numpy as np
+    p50, p95 = np.percentile(samples_ms, [50, 95])
+    return f"p50 {p50:8.1f} ms  p95 {p95:8.1f} ms  max {max(samples_ms):8.1f} ms"
+
+
+async def _upstream_round(base_url: str, repeats: int) -> Dict[str, List[float]]:
+    import httpx
+    import jolpica
+    import ratings
+    import index
+
+    jolpica.BASE_URL = base_url
+    jolpica.FIXTURE_MODE = "off"
+    timings: Dict[str, List[float]] = {"fetch_all_data": [], "datasets_ok": [], "/api/ratings (cold)": [], "/api/race/1 (cold)": []}
+    breaker_states: List[str] = []
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            raw = await jolpica.fetch_all_data()
+            timings["fetch_all_data"].append((time.perf_counter() - t0) * 1000)
+            timings["datasets_ok"].append(sum(v is not None for v in raw.values()))
+            breaker_states.append(jolpica.upstream_status()["breaker"]["state"])
+
+            for path in ("/api/ratings", "/api/race/1"):
+                ratings._cache = {}  # force the upstream fetch on every request
+                t0 = time.perf_counter()
+                resp = await client.get(path)
+                timings[f"{path} (cold)"].append((time.perf_counter() - t0) * 1000)
+                resp.raise_for_status()
+    timings["breaker"] = breaker_states
+    return timings
+
+
+def bench_upstream(args: argparse.Namespace) -> int:
+    """
+    Time fetch_all_data and cold endpoint requests against a local Jolpica
+    stand-in with injected latency / failures (serves recorded fixtures; record
+    them once with `python jolpica_stub.py record`). Fails when a run got no
+    datasets at all, since that only measures the fallback path.
+    """
+    import jolpica
+    if not jolpica.recorded_fixtures():
+        print(f"FAIL: no fixtures in {jolpica.FIXTURE_DIR}; run `python jolpica_stub.py record` first "
+              f"or set JOLPICA_FIXTURE_DIR=../tests/fixtures/jolpica for the hand-built sample")
+        return 1
+
+    proc, base_url = _start_stub(args)
+    try:
+        print(f"stub {base_url}: latency {args.latency_ms}±{args.jitter_ms} ms, "
+              f"error rate {args.error_rate}, hang rate {args.hang_rate}, {args.repeats} repeats")
+        timings = asyncio.run(_upstream_round(base_url, args.repeats))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    ok = timings.pop("datasets_ok")
+    breaker = timings.pop("breaker")
+    for name, samples in timings.items():
+        print(f"{name:<22}{_percentiles(samples)}")
+    print(f"datasets fetched: {min(ok)}-{max(ok)} of 6 per run (live or last known-good)")
+    print(f"breaker state after each run: {', '.join(breaker)}")
+    if min(ok) == 0:
+        print(f"FAIL: {ok.count(0)} of {len(ok)} runs fetched no datasets")
+        return 1
+    return 0
+
+
+# ──────────────────────────────────────────────
+#  CLI
+# ──────────────────────────────────────────────
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="F1 2026 Predictor benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("startup", help="import-time profile of the API entry point")
+    p.add_argument("--budget-ms", type=float, default=600.0)
+    p.add_argument("--top", type=int, default=10)
+    p.set_defaults(func=bench_startup)
+
+    p = sub.add_parser("variance", help="compare Monte Carlo variance-reduction modes")
+    p.add_argument("--round", type=int, default=5)
+    p.add_argument("--iters", type=int, default=8000)
+    p.add_argument("--repeats", type=int, default=5)
+    p.set_defaults(func=bench_variance)
+
+    p = sub.add_parser("analytic", help="cross-check analytic race probabilities against Monte Carlo")
+    p.add_argument("--iters", type=int, default=200000)
+    p.add_argument("--max-se", type=float, default=4.5)
+    p.set_defaults(func=bench_analytic)
+
+    p = sub.add_parser("upstream", help="Jolpica fetch and endpoint latency against a local stand-in")
+    p.add_argument("--latency-ms", type=float, default=0.0)
+    p.add_argument("--jitter-ms", type=float, default=0.0)
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--hang-rate", type=float, default=0.0)
+    p.add_argument("--repeats", type=int, default=5)
+    p.set_defaults(func=bench_upstream)
+
+    args = parser.parse_args(argv)
+    started = time.time()
+    code = args.func(args)
+    print(f"[bench] {args.command} done in {time.time() - started:.1f}s")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
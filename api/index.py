@@ -5,6 +5,8 @@ Vercel's @vercel/python runtime natively supports ASGI apps via the `app` export
 
 import sys
 import os
+import asyncio
+from contextlib import asynccontextmanager
 
 # Add api/ directory to path so sibling modules can be imported
 _api_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,12 +16,45 @@ if _api_dir not in sys.path:
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 
-from data import CIRCUITS, GRID_2026, TEAMS_2026
+# Keep module-level imports light: /api/health and /api/circuits must never pull
+# in NumPy or httpx. Heavy modules are imported inside endpoints and preloaded
+# by the background warm-up below (budget checked by `python bench.py startup`).
+from data import CIRCUITS, GRID_2026, TEAMS_2026, CURRENT_SEASON, available_seasons, load_season
+from offload import run_cpu, stats as offload_stats
+
+WARMUP_ENABLED = os.getenv("F1_WARMUP", "1") != "0"
+ANALYTIC_PREFILL = os.getenv("F1_ANALYTIC_PREFILL", "1") != "0"
+_warmup_task = None
+# season -> (ratings key, future) of the latest analytic cache fill
+_analytic_prefill = {}
+
+
+def _warm_imports() -> None:
+    import monte_carlo
+    import ratings  # noqa: F401  (pulls in jolpica/httpx)
+    import outcome_store  # noqa: F401
+    monte_carlo._race_setup(CURRENT_SEASON, 1)
+
+
+def _ensure_warmup() -> None:
+    """Start preloading heavy modules off the critical path (idempotent)."""
+    global _warmup_task
+    if _warmup_task is None and WARMUP_ENABLED:
+        loop = asyncio.get_running_loop()
+        _warmup_task = loop.run_in_executor(None, _warm_imports)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _ensure_warmup()
+    yield
+
 
 app = FastAPI(
     title="F1 2026 Predictor API",
     description="Monte Carlo simulation engine for Formula 1 2026 season predictions",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -31,26 +66,80 @@ app.add_middleware(
 )
 
 
+class _WarmupMiddleware:
+    """
+    Serverless runtimes may skip lifespan events; the first request of any
+    kind (typically a cheap health check) starts the warm-up instead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            _ensure_warmup()
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(_WarmupMiddleware)
+
+
 @app.get("/api/health")
 async def health():
     return {
         "status": "ok",
         "version": "1.0.0",
-        "season": 2026,
+        "season": CURRENT_SEASON,
+        "seasons": available_seasons(),
         "data_sources": ["jolpica_2024", "jolpica_2025"],
         "drivers": len(GRID_2026),
         "circuits": len(CIRCUITS),
+        "simulation_queues": offload_stats(),
+        "warm": _warmup_task is not None and _warmup_task.done(),
     }
 
 
+def _ratings_key(data: dict) -> str:
+    """Identifies a ratings snapshot so identical concurrent simulations coalesce."""
+    from outcome_store import ratings_fingerprint
+    return ratings_fingerprint(data["car_ratings"], data["driver_ratings"], data.get("circuit_index"))
+
+
+def _prefill_analytic(season: int, data: dict, first_round: int) -> None:
+    from monte_carlo import run_race_analytic
+    rounds = [c["round"] for c in load_season(season)["circuits"]]
+    # The request that triggered the fill computes first_round itself; do it last
+    for rnd in sorted(rounds, key=lambda r: r == first_round):
+        run_race_analytic(
+            rnd, data["car_ratings"], data["driver_ratings"],
+            circuit_index=data.get("circuit_index"), season=season,
+        )
+
+
+def _ensure_analytic_prefill(season: int, data: dict, first_round: int) -> None:
+    """
+    An uncached analytic race costs 0.1-0.4 s, so the first analytic request
+    for a new ratings snapshot (cold start or hourly refresh) fills the cache
+    for every round of the season in the background.
+    """
+    key = _ratings_key(data)
+    if ANALYTIC_PREFILL and _analytic_prefill.get(season, (None,))[0] != key:
+        loop = asyncio.get_running_loop()
+        _analytic_prefill[season] = (key, loop.run_in_executor(None, _prefill_analytic, season, data, first_round))
+
+
 @app.get("/api/ratings")
 async def ratings_endpoint():
-    from ratings import get_ratings
+    from ratings import get_ratings, circuit_index_to_json
     data = await get_ratings()
     return {
         "driver_ratings": data["driver_ratings"],
         "car_ratings": data["car_ratings"],
         "tire_deg": data["tire_deg"],
+        "circuit_index": circuit_index_to_json(data.get("circuit_index")),
+        "degraded": data.get("degraded", False),
+        "circuit_history_missing": data.get("circuit_history_missing", False),
+        "upstream": data.get("upstream"),
         "teams_info": {
             team: {
                 "color": info["color"],
@@ -62,63 +151,178 @@ async def ratings_endpoint():
     }
 
 
+def _check_season(season: int) -> dict:
+    try:
+        return load_season(season)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No data for season {season}")
+
+
+def _check_round(gp_round: int, season: int = CURRENT_SEASON) -> None:
+    circuits = _check_season(season)["circuits"]
+    if gp_round < 1 or gp_round > len(circuits):
+        raise HTTPException(status_code=400, detail=f"Round must be between 1 and {len(circuits)}")
+    circuit = next((c for c in circuits if c["round"] == gp_round), None)
+    if not circuit:
+        raise HTTPException(status_code=404, detail=f"Circuit for round {gp_round} not found")
+
+
 @app.get("/api/race/{gp_round}")
 async def race_prediction(
     gp_round: int,
     iters: int = Query(default=8000, ge=100, le=20000),
+    variance_reduction: str = Query(default="none", pattern="^(none|antithetic|sobol|control_variate)$"),
+    method: str = Query(default="monte_carlo", pattern="^(monte_carlo|analytic)$"),
+    season: int = Query(default=CURRENT_SEASON),
 ):
-    if gp_round < 1 or gp_round > 24:
-        raise HTTPException(status_code=400, detail="Round must be between 1 and 24")
-    circuit = next((c for c in CIRCUITS if c["round"] == gp_round), None)
-    if not circuit:
-        raise HTTPException(status_code=404, detail=f"Circuit for round {gp_round} not found")
+    _check_round(gp_round, season)
+    from ratings import get_ratings
+    from monte_carlo import run_race_simulation, run_race_analytic
+    data = await get_ratings()
+    if method == "analytic":
+        _ensure_analytic_prefill(season, data, gp_round)
+        return await run_cpu(
+            "race", (season, gp_round, "analytic", _ratings_key(data)),
+            run_race_analytic,
+            circuit_round=gp_round,
+            car_ratings=data["car_ratings"],
+            driver_ratings=data["driver_ratings"],
+            circuit_index=data.get("circuit_index"),
+            season=season,
+        )
+    try:
+        result = await run_cpu(
+            "race", (season, gp_round, iters, variance_reduction, _ratings_key(data)),
+            run_race_simulation,
+            circuit_round=gp_round,
+            iters=iters,
+            car_ratings=data["car_ratings"],
+            driver_ratings=data["driver_ratings"],
+            circuit_index=data.get("circuit_index"),
+            variance_reduction=variance_reduction,
+            season=season,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return result
+
+
+@app.get("/api/race/{gp_round}/h2h")
+async def race_h2h(
+    gp_round: int,
+    iters: int = Query(default=8000, ge=100, le=20000),
+    method: str = Query(default="monte_carlo", pattern="^(monte_carlo|analytic)$"),
+    season: int = Query(default=CURRENT_SEASON),
+):
+    _check_round(gp_round, season)
+    from ratings import get_ratings
+    from monte_carlo import run_race_simulation, run_race_analytic
+    data = await get_ratings()
+    if method == "analytic":
+        _ensure_analytic_prefill(season, data, gp_round)
+        result = await run_cpu(
+            "race", (season, gp_round, "analytic", _ratings_key(data), "h2h"),
+            run_race_analytic,
+            circuit_round=gp_round,
+            car_ratings=data["car_ratings"],
+            driver_ratings=data["driver_ratings"],
+            circuit_index=data.get("circuit_index"),
+            h2h=True,
+            season=season,
+        )
+    else:
+        result = await run_cpu(
+            "race", (season, gp_round, iters, _ratings_key(data), "h2h"),
+            run_race_simulation,
+            circuit_round=gp_round,
+            iters=iters,
+            car_ratings=data["car_ratings"],
+            driver_ratings=data["driver_ratings"],
+            circuit_index=data.get("circuit_index"),
+            h2h=True,
+            season=season,
+        )
+    return {
+        "season": season,
+        "circuit": result["circuit"],
+        "iterations": result["iterations"],
+        **result["h2h"],
+    }
+
+
+@app.get("/api/championship")
+async def championship_prediction(
+    iters: int = Query(default=500, ge=50, le=2000),
+    season: int = Query(default=CURRENT_SEASON),
+):
+    _check_season(season)
     from ratings import get_ratings
-    from monte_carlo import run_race_simulation
+    from monte_carlo import run_championship_simulation
     data = await get_ratings()
-    result = run_race_simulation(
-        circuit_round=gp_round,
+    result = await run_cpu(
+        "championship", (season, iters, _ratings_key(data)),
+        run_championship_simulation,
         iters=iters,
         car_ratings=data["car_ratings"],
         driver_ratings=data["driver_ratings"],
+        circuit_index=data.get("circuit_index"),
+        season=season,
     )
     return result
 
 
-@app.get("/api/championship")
-async def championship_prediction(
+@app.get("/api/championship/h2h")
+async def championship_h2h(
     iters: int = Query(default=500, ge=50, le=2000),
+    season: int = Query(default=CURRENT_SEASON),
 ):
+    _check_season(season)
     from ratings import get_ratings
     from monte_carlo import run_championship_simulation
     data = await get_ratings()
-    result = run_championship_simulation(
+    result = await run_cpu(
+        "championship", (season, iters, _ratings_key(data), "h2h"),
+        run_championship_simulation,
         iters=iters,
         car_ratings=data["car_ratings"],
         driver_ratings=data["driver_ratings"],
+        circuit_index=data.get("circuit_index"),
+        h2h=True,
+        season=season,
     )
-    return result
+    return {
+        "season": season,
+        "iterations_per_race": result["iterations_per_race"],
+        "total_races": result["total_races"],
+        **result["h2h"],
+    }
 
 
 @app.get("/api/backtest")
 async def backtest_endpoint(
     iters: int = Query(default=1000, ge=100, le=3000),
+    season: int = Query(default=2024, lt=CURRENT_SEASON),
 ):
+    _check_season(season)
     from ratings import get_ratings
     from monte_carlo import backtest_model
     from jolpica import fetch_race_results
     data = await get_ratings()
-    historical_results = await fetch_race_results(2024)
+    historical_results = await fetch_race_results(season)
     if not historical_results:
         return {"error": "Could not fetch historical results", "metrics": {}}
-    metrics = backtest_model(
+    metrics = await run_cpu(
+        "backtest", (season, iters, _ratings_key(data)),
+        backtest_model,
         historical_results=historical_results,
         car_ratings=data["car_ratings"],
         driver_ratings=data["driver_ratings"],
         iters=iters,
+        season=season,
     )
-    return {"metrics": metrics, "note": "Backtested against 2024 actuals (out-of-sample)"}
+    return {"metrics": metrics, "note": f"Backtested against {season} actuals with the {season} grid and calendar"}
 
 
 @app.get("/api/circuits")
-async def circuits_list():
-    return {"circuits": CIRCUITS}
+async def circuits_list(season: int = Query(default=CURRENT_SEASON)):
+    return {"season": season, "circuits": _check_season(season)["circuits"]}
@@ -1,32 +1,217 @@
 """
 jolpica.py — Async HTTP client for Jolpica API (Ergast mirror)
+
+Resilience:
+  • per-dataset timeouts and jittered exponential backoff in _get,
+  • a total deadline for fetch_all_data,
+  • a circuit breaker that skips upstream calls for a cool-down after repeated
+    failures; failed or skipped fetches fall back to the last response this
+    process fetched successfully (or None after a cold start).
 """
 
 import os
+import json
+import time
+import random
 import asyncio
 import httpx
-from typing import Optional, Any
+from contextvars import ContextVar
+from typing import Optional, Any, Dict, List
 
 BASE_URL = os.getenv("JOLPICA_BASE_URL", "https://api.jolpi.ca/ergast/f1")
-TIMEOUT = 12.0
 MAX_RETRIES = 2
+BACKOFF_BASE = 0.25   # seconds; attempt n sleeps uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**n))
+BACKOFF_MAX = 2.0
+FETCH_DEADLINE = float(os.getenv("JOLPICA_DEADLINE_SECONDS", "15"))
 
+# Per-dataset request timeouts (seconds), keyed by the last path segment.
+# Full-season results are the largest payloads Jolpica serves.
+DATASET_TIMEOUTS: Dict[str, float] = {
+    "constructorStandings": 4.0,
+    "qualifying": 6.0,
+    "results": 8.0,
+}
+DEFAULT_TIMEOUT = 6.0
 
-async def _get(path: str) -> Optional[dict]:
-    """Fetch a JSON resource from Jolpica with retries."""
-    url = f"{BASE_URL}{path}.json"
+BREAKER_FAILURE_THRESHOLD = 3   # consecutive failed fetches before opening
+BREAKER_COOLDOWN = float(os.getenv("JOLPICA_BREAKER_COOLDOWN", "60"))
+
+# Recorded fixtures: "record" saves every successful response to FIXTURE_DIR,
+# "replay" serves responses from disk without touching the network.
+FIXTURE_MODE = os.getenv("JOLPICA_FIXTURE_MODE", "off")
+FIXTURE_DIR = os.getenv(
+    "JOLPICA_FIXTURE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "jolpica"),
+)
+
+
+def fixture_path(path: str) -> str:
+    """'/2024/results' → <FIXTURE_DIR>/2024_results.json"""
+    return os.path.join(FIXTURE_DIR, path.strip("/").replace("/", "_") + ".json")
+
+
+def recorded_fixtures() -> List[str]:
+    """Names of the fixture files in FIXTURE_DIR."""
+    if not os.path.isdir(FIXTURE_DIR):
+        return []
+    return sorted(f for f in os.listdir(FIXTURE_DIR) if f.endswith(".json"))
+
+
+def _load_fixture(path: str) -> Optional[dict]:
+    try:
+        with open(fixture_path(path)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"[jolpica] no fixture for {path} in {FIXTURE_DIR}")
+        return None
+
+
+def _save_fixture(path: str, data: dict) -> None:
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    with open(fixture_path(path), "w") as f:
+        json.dump(data, f)
+
+
+# ──────────────────────────────────────────────
+#  Circuit breaker + last known-good responses
+# ──────────────────────────────────────────────
+class _Breaker:
+    """
+    closed → open after BREAKER_FAILURE_THRESHOLD consecutive failures;
+    open → half-open once BREAKER_COOLDOWN has passed, letting one probe through;
+    the probe's success closes it again, its failure re-opens it.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.skipped = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.probing:
+            self.probing = True
+            return True
+        self.skipped += 1
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.probing or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+    def release_probe(self) -> None:
+        """The probe ended without an answer (its task was cancelled); let the next call probe."""
+        self.probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, "skipped": self.skipped}
+
+
+_breaker = _Breaker(BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN)
+_last_good: Dict[str, dict] = {}
+# path -> "live" | "stale" | "missing" | "replay" for the most recent fetch of each resource
+_last_source: Dict[str, str] = {}
+# Absolute time.monotonic() by which the current fetch_all_data must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("jolpica_deadline", default=None)
+
+
+def _fallback(path: str) -> Optional[dict]:
+    """
+    Last known-good response for path from this process's memory. Fixtures are
+    never used here: they are only read when FIXTURE_MODE is "replay".
+    """
+    data = _last_good.get(path)
+    _last_source[path] = "missing" if data is None else "stale"
+    return data
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return code == 429 or code >= 500
+    return True  # timeouts, connection errors, malformed bodies
+
+
+async def _fetch(url: str, timeout: float) -> dict:
+    """GET with jittered exponential backoff; raises the last error once retries are spent."""
     for attempt in range(MAX_RETRIES + 1):
         try:
-            async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+            async with httpx.AsyncClient(timeout=timeout) as client:
                 resp = await client.get(url, params={"limit": 1000})
                 resp.raise_for_status()
                 return resp.json()
         except Exception as exc:
-            if attempt == MAX_RETRIES:
-                print(f"[jolpica] FAILED {url}: {exc}")
-                return None
-            await asyncio.sleep(0.5 * (attempt + 1))
-    return None
+            if attempt == MAX_RETRIES or not _retryable(exc):
+                raise
+            await asyncio.sleep(_backoff(attempt))
+
+
+async def _get(path: str) -> Optional[dict]:
+    """Fetch a JSON resource from Jolpica with retries; falls back to the last known-good copy."""
+    if FIXTURE_MODE == "replay":
+        _last_source[path] = "replay"
+        return _load_fixture(path)
+    if not _breaker.allow():
+        return _fallback(path)
+
+    url = f"{BASE_URL}{path}.json"
+    timeout = DATASET_TIMEOUTS.get(path.rsplit("/", 1)[-1], DEFAULT_TIMEOUT)
+    deadline = _deadline.get()
+    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+    try:
+        data = await asyncio.wait_for(_fetch(url, timeout), remaining)
+    except asyncio.TimeoutError:
+        print(f"[jolpica] FAILED {url}: fetch deadline exceeded")
+        _breaker.record_failure()
+        return _fallback(path)
+    except Exception as exc:
+        print(f"[jolpica] FAILED {url}: {exc}")
+        if _retryable(exc):
+            _breaker.record_failure()
+        else:
+            _breaker.record_success()  # upstream answered; the resource is the problem
+        return _fallback(path)
+    except BaseException:
+        # CancelledError (e.g. the request was dropped): says nothing about upstream,
+        # but a half-open probe must not stay in flight forever
+        _breaker.release_probe()
+        raise
+
+    if FIXTURE_MODE == "record":
+        _save_fixture(path, data)
+    _breaker.record_success()
+    _last_good[path] = data
+    _last_source[path] = "live"
+    return data
+
+
+def upstream_status() -> Dict[str, Any]:
+    """Breaker state and where each resource's latest data came from."""
+    return {"breaker": _breaker.stats(), "sources": dict(_last_source)}
 
 
 async def fetch_constructor_standings(year: int) -> Optional[list]:
@@ -56,6 +241,8 @@ async def fetch_race_results(year: int) -> Optional[list]:
             for result in race.get("Results", []):
                 all_results.append({
                     "round": int(race["round"]),
+                    "circuitId": race.get("Circuit", {}).get("circuitId", ""),
+                    "constructor": result.get("Constructor", {}).get("name", ""),
                     "driverCode": result["Driver"].get("code", ""),
                     "position": int(result.get("position", 99)),
                     "points": float(result.get("points", 0)),
@@ -86,20 +273,44 @@ async def fetch_qualifying_results(year: int) -> Optional[list]:
         return None
 
 
-async def fetch_all_data() -> dict:
-    """Fetch all required data concurrently."""
-    results = await asyncio.gather(
-        fetch_constructor_standings(2024),
-        fetch_race_results(2024),
-        fetch_race_results(2025),
-        fetch_qualifying_results(2024),
-        fetch_qualifying_results(2025),
-        return_exceptions=False,
-    )
+# fetch_all_data result key -> resource path (as reported by upstream_status)
+DATASET_PATHS: Dict[str, str] = {
+    "constructor_standings_2024": "/2024/constructorStandings",
+    "race_results_2024": "/2024/results",
+    "race_results_2025": "/2025/results",
+    "qualifying_2024": "/2024/qualifying",
+    "qualifying_2025": "/2025/qualifying",
+    "race_results_2023": "/2023/results",
+}
+
+
+async def fetch_all_data(deadline: float = None) -> dict:
+    """
+    Fetch all required data concurrently within a total deadline (default
+    FETCH_DEADLINE seconds). A dataset that fails or runs past the deadline
+    falls back to its last known-good copy, or None if there is none, so
+    callers always get whatever is available.
+    """
+    # Reset afterwards: later _get calls in the same task (e.g. the backtest's
+    # fetch_race_results after get_ratings) must not inherit an expired deadline.
+    token = _deadline.set(time.monotonic() + (FETCH_DEADLINE if deadline is None else deadline))
+    try:
+        results = await asyncio.gather(
+            fetch_constructor_standings(2024),
+            fetch_race_results(2024),
+            fetch_race_results(2025),
+            fetch_qualifying_results(2024),
+            fetch_qualifying_results(2025),
+            fetch_race_results(2023),
+            return_exceptions=False,
+        )
+    finally:
+        _deadline.reset(token)
     return {
         "constructor_standings_2024": results[0],
         "race_results_2024": results[1],
         "race_results_2025": results[2],
         "qualifying_2024": results[3],
         "qualifying_2025": results[4],
+        "race_results_2023": results[5],  # circuit index history only
     }
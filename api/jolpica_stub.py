@@ -0,0 +1,127 @@
+"""
+jolpica_stub.py — Local stand-in for the Jolpica API, served from recorded fixtures.
+
+Point the API at it with JOLPICA_BASE_URL to load-test or benchmark without
+api.jolpi.ca. Latency and failures are injectable, so the retry/backoff in
+jolpica._get and end-to-end endpoint latency can be measured under a slow or
+flaky upstream.
+
+    python jolpica_stub.py record                    # fetch real responses once into fixtures/
+    python jolpica_stub.py serve --port 8001 --latency-ms 800 --error-rate 0.2
+    JOLPICA_BASE_URL=http://127.0.0.1:8001/ergast/f1 uvicorn index:app --port 8000
+
+Settings can also be changed at runtime: POST /_stub/config {"latency_ms": 0, ...}
+"""
+
+import os
+import sys
+import random
+import asyncio
+import argparse
+from typing import Dict, List
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response
+
+_api_dir = os.path.dirname(os.path.abspath(__file__))
+if _api_dir not in sys.path:
+    sys.path.insert(0, _api_dir)
+
+import jolpica
+
+STUB_CONFIG: Dict[str, float] = {
+    "latency_ms": float(os.getenv("STUB_LATENCY_MS", "0")),
+    "jitter_ms": float(os.getenv("STUB_JITTER_MS", "0")),
+    "error_rate": float(os.getenv("STUB_ERROR_RATE", "0")),      # fraction answered 503
+    "hang_rate": float(os.getenv("STUB_HANG_RATE", "0")),        # fraction that never answer in time
+}
+_stats: Dict[str, int] = {"requests": 0, "errors": 0, "hangs": 0, "missing": 0}
+
+app = FastAPI(title="Jolpica stand-in", docs_url=None, redoc_url=None)
+
+
+@app.get("/_stub/config")
+async def get_config():
+    return {"config": STUB_CONFIG, "stats": _stats, "fixture_dir": jolpica.FIXTURE_DIR}
+
+
+@app.post("/_stub/config")
+async def set_config(update: Dict[str, float]):
+    unknown = set(update) - set(STUB_CONFIG)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown settings: {sorted(unknown)}")
+    STUB_CONFIG.update({k: float(v) for k, v in update.items()})
+    for key in _stats:
+        _stats[key] = 0
+    return {"config": STUB_CONFIG}
+
+
+@app.get("/ergast/f1/{path:path}")
+async def ergast(path: str):
+    _stats["requests"] += 1
+    delay = STUB_CONFIG["latency_ms"] + random.uniform(-1, 1) * STUB_CONFIG["jitter_ms"]
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+
+    if random.random() < STUB_CONFIG["hang_rate"]:
+        _stats["hangs"] += 1
+        await asyncio.sleep(3600)  # client timeout fires first
+    if random.random() < STUB_CONFIG["error_rate"]:
+        _stats["errors"] += 1
+        raise HTTPException(status_code=503, detail="Injected upstream failure")
+
+    resource = "/" + path[:-len(".json")] if path.endswith(".json") else "/" + path
+    fixture = jolpica.fixture_path(resource)
+    if not os.path.exists(fixture):
+        _stats["missing"] += 1
+        raise HTTPException(status_code=404, detail=f"No fixture for {resource}")
+    with open(fixture, "rb") as f:
+        return Response(content=f.read(), media_type="application/json")
+
+
+# ──────────────────────────────────────────────
+#  CLI
+# ──────────────────────────────────────────────
+def record() -> None:
+    """Fetch every dataset the API uses from the real upstream and save it as fixtures."""
+    jolpica.FIXTURE_MODE = "record"
+    data = asyncio.run(jolpica.fetch_all_data())
+    missing = [name for name, value in data.items() if value is None]
+    print(f"[stub] recorded {len(data) - len(missing)}/{len(data)} datasets into {jolpica.FIXTURE_DIR}")
+    if missing:
+        print(f"[stub] failed: {', '.join(missing)}")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local Jolpica stand-in server")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("record", help="record real Jolpica responses as fixtures")
+    p = sub.add_parser("serve", help="serve fixtures over HTTP")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8001)
+    p.add_argument("--latency-ms", type=float, default=STUB_CONFIG["latency_ms"])
+    p.add_argument("--jitter-ms", type=float, default=STUB_CONFIG["jitter_ms"])
+    p.add_argument("--error-rate", type=float, default=STUB_CONFIG["error_rate"])
+    p.add_argument("--hang-rate", type=float, default=STUB_CONFIG["hang_rate"])
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record()
+        return
+
+    if not jolpica.recorded_fixtures():
+        print(f"[stub] no fixtures in {jolpica.FIXTURE_DIR}; run `python jolpica_stub.py record` first")
+        sys.exit(1)
+
+    import uvicorn
+    STUB_CONFIG.update({
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "hang_rate": args.hang_rate,
+    })
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
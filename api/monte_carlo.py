@@ -2,83 +2,481 @@
 monte_carlo.py — Vectorized Monte Carlo simulation engine for F1 2026.
 
 8,000 iterations per race (default), full NumPy vectorization.
+Any season with a data file in seasons/ can be simulated (season=2024 / 2025
+for backtesting); the field of each round comes from data.season_entries().
 """
 
 import numpy as np
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 
-from data import GRID_2026, TEAMS_2026, CIRCUITS, POINTS_SYSTEM, DRIVER_CODES, NEW_ENGINE_TEAMS
+from data import POINTS_SYSTEM, CURRENT_SEASON, load_season, season_entries, season_circuit
+
+# One round's field: ((driver code, team), ...) as returned by data.season_entries()
+Field = Tuple[Tuple[str, str], ...]
 
 
 # ──────────────────────────────────────────────
 #  Core simulation
 # ──────────────────────────────────────────────
 
+@lru_cache(maxsize=32)
+def _grid_index(season: int, entries: Field) -> Dict[str, Any]:
+    """Index arrays over one race field, built once per distinct field."""
+    data = load_season(season)
+    teams = list(data["teams"].keys())
+    codes = [code for code, _ in entries]
+    team_idx = np.array([teams.index(team) for _, team in entries], dtype=np.intp)
+    heat_sensitive = np.array(
+        [data["drivers"][code]["new_team"] or team in data["new_engine_teams"] for code, team in entries]
+    )
+    for arr in (team_idx, heat_sensitive):
+        arr.flags.writeable = False
+    return {
+        "season": season,
+        "entries": entries,
+        "codes": codes,
+        "teams": teams,
+        "team_idx": team_idx,
+        "heat_sensitive": heat_sensitive,
+    }
+
+
+def _race_setup(season: int, circuit_round: int) -> Tuple[dict, Dict[str, Any], Dict[str, Any]]:
+    """(circuit, grid index, noise structure) for one round of a season."""
+    entries = season_entries(season, circuit_round)
+    return season_circuit(season, circuit_round), _grid_index(season, entries), _noise_structure(season, entries)
+
+
+def _circuit_multiplier(
+    circuit: dict,
+    grid: Dict[str, Any],
+    circuit_index: Optional[Dict[str, Any]],
+) -> Optional[np.ndarray]:
+    """
+    Per-driver historical performance multiplier at this circuit (see
+    ratings._compute_circuit_index). Rows are matched by circuit id and columns
+    by driver code / team, so drivers or teams outside the index stay neutral.
+    """
+    if circuit_index is None or circuit["circuit_id"] not in circuit_index["circuit_ids"]:
+        return None
+    row = circuit_index["circuit_ids"].index(circuit["circuit_id"])
+    drv_col = {code: j for j, code in enumerate(circuit_index["drivers"])}
+    team_col = {team: j for j, team in enumerate(circuit_index["teams"])}
+    driver = np.array(
+        [circuit_index["driver"][row, drv_col[code]] if code in drv_col else 1.0 for code, _ in grid["entries"]],
+        dtype=np.float32,
+    )
+    team = np.array(
+        [circuit_index["team"][row, team_col[t]] if t in team_col else 1.0 for _, t in grid["entries"]],
+        dtype=np.float32,
+    )
+    return driver * team
+
+
 def _build_base_scores(
     circuit: dict,
+    grid: Dict[str, Any],
     car_ratings: Dict[str, float],
     driver_ratings: Dict[str, float],
+    circuit_index: Optional[Dict[str, Any]] = None,
 ) -> np.ndarray:
     """
-    Build base performance scores for all 22 drivers for a given circuit.
-    Returns shape (22,) float64 array.
+    Build base performance scores for every driver in the field at a given circuit.
+    Returns shape (n_drivers,) float64 array.
     """
     is_street = circuit["type"] == "street"
     car_w = 0.52 if is_street else 0.62
     drv_w = 1.0 - car_w
 
-    scores = np.zeros(len(DRIVER_CODES), dtype=np.float64)
     overtaking = circuit.get("overtaking", 5)
     temp = circuit.get("temp", 22)
 
-    for i, code in enumerate(DRIVER_CODES):
-        info = GRID_2026[code]
-        team = info["team"]
-        car_r = car_ratings.get(team, 70.0)
-        drv_r = driver_ratings.get(code, 70.0)
-        score = car_r * car_w + drv_r * drv_w
+    car_r = np.array([car_ratings.get(team, 70.0) for team in grid["teams"]])[grid["team_idx"]]
+    drv_r = np.array([driver_ratings.get(code, 70.0) for code in grid["codes"]])
+    scores = car_r * car_w + drv_r * drv_w
 
-        # Circuit modifiers
-        if overtaking >= 8:
-            score *= 1.015
-        elif overtaking <= 3:
-            if drv_r > 85:
-                score *= 1.04  # stars shine on street circuits
-            else:
-                score *= 0.96
+    # Circuit modifiers
+    if overtaking >= 8:
+        scores *= 1.015
+    elif overtaking <= 3:
+        scores *= np.where(drv_r > 85, 1.04, 0.96)  # stars shine on street circuits
 
-        if temp > 29 and (info["new_team"] or team in NEW_ENGINE_TEAMS):
-            score *= 0.97
+    if temp > 29:
+        scores *= np.where(grid["heat_sensitive"], 0.97, 1.0)
 
-        scores[i] = score
+    multiplier = _circuit_multiplier(circuit, grid, circuit_index)
+    if multiplier is not None:
+        scores *= multiplier
 
     return scores
 
 
-def _get_dnf_probs() -> np.ndarray:
-    """Returns shape (22,) DNF probability per driver."""
-    probs = np.zeros(len(DRIVER_CODES), dtype=np.float64)
-    for i, code in enumerate(DRIVER_CODES):
-        info = GRID_2026[code]
-        team = info["team"]
-        if info["new_team"] or team == "Cadillac":
+def _get_dnf_probs(grid: Dict[str, Any]) -> np.ndarray:
+    """Returns shape (n_drivers,) DNF probability per driver."""
+    data = load_season(grid["season"])
+    probs = np.zeros(len(grid["codes"]), dtype=np.float64)
+    for i, (code, team) in enumerate(grid["entries"]):
+        if data["drivers"][code]["new_team"] or team in data["new_entrant_teams"]:
             probs[i] = 0.07
-        elif team in NEW_ENGINE_TEAMS:
+        elif team in data["new_engine_teams"]:
             probs[i] = 0.05
         else:
             probs[i] = 0.03
     return probs
 
 
-def run_race_simulation(
+# ──────────────────────────────────────────────
+#  Hierarchical noise model
+# ──────────────────────────────────────────────
+
+# ±9% regulatory era uncertainty, split into a per-race car component shared
+# by teammates and an individual driver component (combined sigma unchanged).
+TEAM_NOISE_SD = 0.06
+DRIVER_NOISE_SD = float(np.sqrt(0.09 ** 2 - TEAM_NOISE_SD ** 2))
+
+# Power-unit batch issues: per-race probability that a new-engine supplier has
+# a problem, and the chance each customer car retires when it does.
+PU_ISSUE_PROB = 0.08
+PU_ISSUE_DNF_PROB = 0.5
+
+
+@lru_cache(maxsize=32)
+def _noise_structure(season: int, entries: Field) -> Dict[str, Any]:
+    """
+    Precompute the index arrays describing the correlation structure of a field.
+    Residual per-driver DNF probabilities are solved so that each driver's
+    marginal DNF rate still matches _get_dnf_probs().
+    """
+    data = load_season(season)
+    grid = _grid_index(season, entries)
+    suppliers = sorted({data["teams"][t]["engine"] for t in data["new_engine_teams"]})
+
+    team_idx = grid["team_idx"]
+    pu_drivers = np.array(
+        [i for i, (_, team) in enumerate(entries) if team in data["new_engine_teams"]],
+        dtype=np.intp,
+    )
+    pu_supplier_idx = np.array(
+        [suppliers.index(data["teams"][entries[i][1]]["engine"]) for i in pu_drivers],
+        dtype=np.intp,
+    )
+
+    dnf_probs = _get_dnf_probs(grid)
+    own_dnf = dnf_probs.copy()
+    own_dnf[pu_drivers] = 1.0 - (1.0 - dnf_probs[pu_drivers]) / (1.0 - PU_ISSUE_PROB * PU_ISSUE_DNF_PROB)
+
+    structure = {
+        "n_teams": len(grid["teams"]),
+        "n_suppliers": len(suppliers),
+        "team_idx": team_idx,
+        "pu_drivers": pu_drivers,
+        "pu_supplier_idx": pu_supplier_idx,
+        "dnf_probs": dnf_probs,
+        "own_dnf": own_dnf,
+    }
+    for arr in structure.values():
+        if isinstance(arr, np.ndarray) and arr.flags.writeable:
+            arr.flags.writeable = False
+    return structure
+
+
+def _draw_shocks(rng: np.random.Generator, iters: int, structure: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Batched draws of every random input for `iters` races."""
+    n_drivers = len(structure["own_dnf"])
+    return {
+        "team_z": rng.standard_normal((iters, structure["n_teams"])),
+        "driver_z": rng.standard_normal((iters, n_drivers)),
+        "dnf_u": rng.random((iters, n_drivers)),
+        "pu_u": rng.random((iters, structure["n_suppliers"])),
+        "pu_hit_u": rng.random((iters, len(structure["pu_drivers"]))),
+    }
+
+
+def _apply_shocks(
+    base_scores: np.ndarray,
+    shocks: Dict[str, np.ndarray],
+    structure: Dict[str, Any],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Turn raw shocks into race scores.
+    Returns (scores, dnf) with shape (iters, n_drivers); DNF scores are -inf.
+    """
+    noise = TEAM_NOISE_SD * shocks["team_z"][:, structure["team_idx"]] + DRIVER_NOISE_SD * shocks["driver_z"]
+    scores = base_scores * (1.0 + noise)
+
+    dnf = shocks["dnf_u"] < structure["own_dnf"]
+    pu_issue = shocks["pu_u"] < PU_ISSUE_PROB
+    pu_dnf = pu_issue[:, structure["pu_supplier_idx"]] & (shocks["pu_hit_u"] < PU_ISSUE_DNF_PROB)
+    dnf[:, structure["pu_drivers"]] |= pu_dnf
+
+    scores[dnf] = -np.inf
+    return scores, dnf
+
+
+def _rank_positions(scores: np.ndarray) -> np.ndarray:
+    """Zero-based finishing position of every driver, shape (iters, n_drivers)."""
+    iters, n_drivers = scores.shape
+    ranking = np.argsort(-scores, axis=1)  # index of driver in position order
+    positions = np.empty_like(ranking)
+    np.put_along_axis(positions, ranking, np.broadcast_to(np.arange(n_drivers), (iters, n_drivers)), axis=1)
+    return positions
+
+
+# ──────────────────────────────────────────────
+#  Variance reduction
+# ──────────────────────────────────────────────
+
+VARIANCE_REDUCTION_MODES = ("none", "antithetic", "sobol", "control_variate")
+SOBOL_REPLICATES = 8  # independent scrambles, used for the QMC standard error
+
+_NORMAL_SHOCKS = ("team_z", "driver_z")
+_UNIFORM_SHOCKS = ("dnf_u", "pu_u", "pu_hit_u")
+
+
+def _antithetic_shocks(rng: np.random.Generator, iters: int, structure: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Mirrored pairs in adjacent rows: z/-z for normals, u/1-u for uniforms."""
+    half = _draw_shocks(rng, (iters + 1) // 2, structure)
+    shocks = {}
+    for name, arr in half.items():
+        mirror = -arr if name in _NORMAL_SHOCKS else 1.0 - arr
+        shocks[name] = np.stack([arr, mirror], axis=1).reshape(-1, arr.shape[1])
+    return shocks
+
+
+def _sobol_shocks(rng: np.random.Generator, iters: int, structure: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Scrambled Sobol draws, SOBOL_REPLICATES contiguous blocks of 2**m points
+    (largest power of two fitting in iters). Requires scipy.
+    """
+    try:
+        from scipy.stats import qmc
+        from scipy.special import ndtri
+    except ImportError:
+        raise ValueError("sobol variance reduction requires scipy")
+
+    n_drivers = len(structure["own_dnf"])
+    widths = {
+        "team_z": structure["n_teams"],
+        "driver_z": n_drivers,
+        "dnf_u": n_drivers,
+        "pu_u": structure["n_suppliers"],
+        "pu_hit_u": len(structure["pu_drivers"]),
+    }
+    m = max(int(np.log2(max(iters // SOBOL_REPLICATES, 2))), 1)
+    u = np.concatenate([
+        qmc.Sobol(sum(widths.values()), scramble=True, seed=rng).random_base2(m)
+        for _ in range(SOBOL_REPLICATES)
+    ])
+
+    shocks = {}
+    col = 0
+    for name, width in widths.items():
+        block = u[:, col:col + width]
+        shocks[name] = ndtri(np.clip(block, 1e-12, 1 - 1e-12)) if name in _NORMAL_SHOCKS else block
+        col += width
+    return shocks
+
+
+def _block_estimate(y: np.ndarray, block: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and standard error from i.i.d. groups of `block` consecutive rows."""
+    means = y.reshape(-1, block, y.shape[1]).mean(axis=1)
+    return means.mean(axis=0), means.std(axis=0, ddof=1) / np.sqrt(len(means))
+
+
+def _control_variate_estimate(y: np.ndarray, controls: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-driver regression estimator. y is (iters, 22), controls (iters, 22, k)
+    with known mean zero. Returns adjusted mean and its standard error.
+    """
+    iters = y.shape[0]
+    xc = controls - controls.mean(axis=0)
+    yc = y - y.mean(axis=0)
+    xtx = np.einsum("tik,til->ikl", xc, xc) + 1e-12 * np.eye(controls.shape[2])
+    xty = np.einsum("tik,ti->ik", xc, yc)
+    beta = np.linalg.solve(xtx, xty[..., None])[..., 0]  # (22, k)
+    adjusted = y - np.einsum("tik,ik->ti", controls, beta)
+    return np.clip(adjusted.mean(axis=0), 0.0, 1.0), adjusted.std(axis=0, ddof=1) / np.sqrt(iters)
+
+
+def _score_controls(
+    base_scores: np.ndarray,
+    shocks: Dict[str, np.ndarray],
+    dnf: np.ndarray,
+    structure: Dict[str, Any],
+) -> np.ndarray:
+    """
+    Zero-mean controls tied to the expected score ordering, shape (iters, 22, 3):
+    own score deviation, rivals' base-weighted score deviation, and DNF surprise.
+    """
+    noise = TEAM_NOISE_SD * shocks["team_z"][:, structure["team_idx"]] + DRIVER_NOISE_SD * shocks["driver_z"]
+    deviation = noise * base_scores
+    rivals = (deviation.sum(axis=1, keepdims=True) - deviation) / (base_scores.sum() - base_scores)
+    return np.stack([deviation, rivals, dnf - structure["dnf_probs"]], axis=2)
+
+
+# ──────────────────────────────────────────────
+#  Analytic race probabilities (no sampling)
+# ──────────────────────────────────────────────
+#
+# Given the per-race team shocks and the supplier PU issue states, every
+# driver's score is an independent Gaussian and every DNF an independent
+# Bernoulli. So we enumerate the 2**n_suppliers PU states, integrate each
+# team's shock with Gauss-Hermite quadrature, and integrate the leading
+# driver's score over a grid; the number of classified drivers above a given
+# score is a product of per-team count polynomials.
+
+ANALYTIC_GRID_POINTS = 241
+ANALYTIC_TEAM_NODES = 16
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF via the Numerical Recipes erfc fit (relative error < 1.2e-7)."""
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = -1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (-0.18628806 + t * (
+        0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (-0.82215223 + t * 0.17087277))))))))
+    erfc = t * np.exp(-z * z + poly)
+    return np.where(x >= 0, 1.0 - 0.5 * erfc, 0.5 * erfc)
+
+
+def _poly_mul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Product of count distributions stored along the last axis (broadcast over the rest)."""
+    shape = np.broadcast_shapes(a.shape[:-1], b.shape[:-1]) + (a.shape[-1] + b.shape[-1] - 1,)
+    out = np.zeros(shape, dtype=np.float64)
+    for j in range(b.shape[-1]):
+        out[..., j:j + a.shape[-1]] += a * b[..., j:j + 1]
+    return out
+
+
+def _supplier_states(structure: Dict[str, Any]):
+    """Yields (probability, per-driver DNF probabilities) for every PU issue combination."""
+    own = structure["own_dnf"]
+    pu_drivers = structure["pu_drivers"]
+    n_sup = structure["n_suppliers"]
+    for mask in range(2 ** n_sup):
+        issues = np.array([(mask >> s) & 1 for s in range(n_sup)], dtype=bool)
+        weight = float(np.prod(np.where(issues, PU_ISSUE_PROB, 1.0 - PU_ISSUE_PROB)))
+        dnf = own.copy()
+        hit = issues[structure["pu_supplier_idx"]]
+        dnf[pu_drivers[hit]] = 1.0 - (1.0 - own[pu_drivers[hit]]) * (1.0 - PU_ISSUE_DNF_PROB)
+        yield weight, dnf
+
+
+def _analytic_positions(base_scores: np.ndarray, structure: Dict[str, Any]) -> np.ndarray:
+    """pos_prob[driver, pos] = P(driver classified in position pos), zero-based."""
+    n_drivers = len(base_scores)
+    team_idx = structure["team_idx"]
+    teams = [np.flatnonzero(team_idx == k) for k in range(structure["n_teams"])]
+
+    sigma = np.hypot(TEAM_NOISE_SD, DRIVER_NOISE_SD)
+    x = np.linspace(base_scores.min() * (1 - 8 * sigma), base_scores.max() * (1 + 8 * sigma), ANALYTIC_GRID_POINTS)
+    wx = np.full(len(x), x[1] - x[0])
+    wx[[0, -1]] *= 0.5  # trapezoid rule
+    z, wz = np.polynomial.hermite_e.hermegauss(ANALYTIC_TEAM_NODES)
+    wz = wz / wz.sum()
+
+    # Conditional on team shock node q: score ~ N(mu[q, j], sd[j])
+    mu = base_scores * (1.0 + TEAM_NOISE_SD * z[:, None])        # (Q, 22)
+    sd = base_scores * DRIVER_NOISE_SD                           # (22,)
+    u = (x[None, :, None] - mu[:, None, :]) / sd                 # (Q, G, 22)
+    above_score = 1.0 - _norm_cdf(u)
+    density = np.exp(-0.5 * u * u) / (np.sqrt(2.0 * np.pi) * sd)
+
+    pos_prob = np.zeros((n_drivers, n_drivers), dtype=np.float64)
+    for weight, dnf in _supplier_states(structure):
+        above = (1.0 - dnf) * above_score                        # P(classified above x | node)
+        bernoulli = np.stack([1.0 - above, above], axis=-1)      # (Q, G, 22, 2)
+        classified_density = (1.0 - dnf) * density
+
+        # Count of each team's classified drivers above x, team shock integrated out
+        team_counts = []
+        for members in teams:
+            counts = np.ones(above.shape[:2] + (1,))
+            for j in members:
+                counts = _poly_mul(counts, bernoulli[:, :, j])
+            team_counts.append(np.einsum("q,qgc->gc", wz, counts))
+
+        # Product over all other teams = prefix[k] * suffix[k + 1]
+        prefix = [np.ones((len(x), 1))]
+        for counts in team_counts:
+            prefix.append(_poly_mul(prefix[-1], counts))
+        suffix = [np.ones((len(x), 1))]
+        for counts in reversed(team_counts):
+            suffix.append(_poly_mul(suffix[-1], counts))
+        suffix.reverse()
+
+        for k, members in enumerate(teams):
+            others = _poly_mul(prefix[k], suffix[k + 1])
+            for i in members:
+                mates = np.ones(above.shape[:2] + (1,))
+                for j in members:
+                    if j != i:
+                        mates = _poly_mul(mates, bernoulli[:, :, j])
+                own = np.einsum("q,qg,qgc->gc", wz, classified_density[:, :, i], mates)
+                pos_prob[i] += weight * (wx @ _poly_mul(own, others))
+    return pos_prob
+
+
+def _analytic_ahead(base_scores: np.ndarray, structure: Dict[str, Any]) -> np.ndarray:
+    """ahead[i, j] = P(i classified ahead of j), closed form per PU state."""
+    same_team = structure["team_idx"][:, None] == structure["team_idx"][None, :]
+    b_i, b_j = base_scores[:, None], base_scores[None, :]
+    var = (TEAM_NOISE_SD ** 2 * (b_i ** 2 + b_j ** 2 - 2.0 * b_i * b_j * same_team)
+           + DRIVER_NOISE_SD ** 2 * (b_i ** 2 + b_j ** 2))
+    np.fill_diagonal(var, 1.0)
+    beats = _norm_cdf((b_i - b_j) / np.sqrt(var))
+
+    ahead = np.zeros_like(beats)
+    for weight, dnf in _supplier_states(structure):
+        fin_i, fin_j = 1.0 - dnf[:, None], 1.0 - dnf[None, :]
+        ahead += weight * (fin_i * (1.0 - fin_j) + fin_i * fin_j * beats)
+    np.fill_diagonal(ahead, 0.0)
+    return ahead
+
+
+def _analytic_inputs(
+    season: int,
+    circuit_round: int,
+    car_items: tuple,
+    driver_items: tuple,
+    multiplier: Optional[tuple],
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    circuit, grid, structure = _race_setup(season, circuit_round)
+    base_scores = _build_base_scores(circuit, grid, dict(car_items), dict(driver_items))
+    if multiplier is not None:
+        base_scores *= np.array(multiplier)
+    return base_scores, structure
+
+
+# Cached per (season, round, ratings snapshot); the position table and the h2h
+# matrix are cached separately so h2h requests reuse the positions. Read-only.
+@lru_cache(maxsize=64)
+def _analytic_positions_cached(*key) -> np.ndarray:
+    pos_prob = _analytic_positions(*_analytic_inputs(*key))
+    pos_prob.flags.writeable = False
+    return pos_prob
+
+
+@lru_cache(maxsize=64)
+def _analytic_ahead_cached(*key) -> np.ndarray:
+    ahead = _analytic_ahead(*_analytic_inputs(*key))
+    ahead.flags.writeable = False
+    return ahead
+
+
+def run_race_analytic(
     circuit_round: int,
-    iters: int = 8000,
     car_ratings: Dict[str, float] = None,
     driver_ratings: Dict[str, float] = None,
+    h2h: bool = False,
+    circuit_index: Optional[Dict[str, Any]] = None,
+    season: int = CURRENT_SEASON,
 ) -> Dict[str, Any]:
     """
-    Run Monte Carlo simulation for a specific GP round.
-    Returns full result dict with per-driver statistics.
+    Deterministic race probabilities by quadrature, same shape as
+    run_race_simulation(). The probability tables are cached per (season,
+    round, ratings snapshot); only the response rows are rebuilt per call.
     """
     from ratings import FALLBACK_CAR_RATINGS, FALLBACK_DRIVER_RATINGS
 
@@ -86,68 +484,115 @@ def run_race_simulation(
         car_ratings = FALLBACK_CAR_RATINGS
     if driver_ratings is None:
         driver_ratings = FALLBACK_DRIVER_RATINGS
+    circuit, grid, _ = _race_setup(season, circuit_round)
+    multiplier = _circuit_multiplier(circuit, grid, circuit_index)
+    key = (
+        season,
+        circuit_round,
+        tuple(sorted(car_ratings.items())),
+        tuple(sorted(driver_ratings.items())),
+        None if multiplier is None else tuple(multiplier.tolist()),
+    )
+
+    n_drivers = len(grid["codes"])
+    pos_prob = _analytic_positions_cached(*key)
+    zeros = np.zeros(n_drivers)
+    result = {
+        "season": season,
+        "circuit": circuit,
+        "iterations": 0,
+        "method": "analytic",
+        "results": _driver_results(
+            pos_prob, pos_prob[:, 0], pos_prob[:, :3].sum(axis=1), zeros, zeros,
+            pos_prob @ _points_table(n_drivers), car_ratings, driver_ratings, grid,
+        ),
+    }
+    if h2h:
+        result["h2h"] = _h2h_payload(_analytic_ahead_cached(*key), grid["codes"])
+    return result
 
-    # Find circuit
-    circuit = next((c for c in CIRCUITS if c["round"] == circuit_round), CIRCUITS[0])
-
-    n_drivers = len(DRIVER_CODES)
-    base_scores = _build_base_scores(circuit, car_ratings, driver_ratings)
-    dnf_probs = _get_dnf_probs()
-    pts_arr = np.array(POINTS_SYSTEM[:n_drivers], dtype=np.float64)
-
-    # Accumulators
-    wins = np.zeros(n_drivers, dtype=np.int64)
-    podiums = np.zeros(n_drivers, dtype=np.int64)
-    total_points = np.zeros(n_drivers, dtype=np.float64)
-    pos_dist = np.zeros((n_drivers, n_drivers), dtype=np.int64)  # [driver, pos]
-
-    rng = np.random.default_rng()
-
-    for _ in range(iters):
-        # Noise: ±9% regulatory era uncertainty
-        noise = rng.normal(0.0, 0.09, n_drivers)
-        scores = base_scores * (1.0 + noise)
-
-        # DNF mask
-        dnf_mask = rng.random(n_drivers) < dnf_probs
-        scores[dnf_mask] = -999.0
-
-        # Rank (descending score = position 1)
-        ranking = np.argsort(-scores)  # index of driver in position order
-
-        for pos, driver_idx in enumerate(ranking):
-            if scores[driver_idx] <= -999.0:
-                continue  # DNF — no points, no position credit
-            pos_dist[driver_idx, pos] += 1
-            if pos < len(pts_arr):
-                total_points[driver_idx] += pts_arr[pos]
-            if pos == 0:
-                wins[driver_idx] += 1
-            if pos <= 2:
-                podiums[driver_idx] += 1
-
-    # Compute statistics
+
+def _make_rng(seed: Optional[int], circuit_round: int) -> np.random.Generator:
+    """Per-round generator; a given seed reproduces the same draws for a round in race and season runs."""
+    if seed is None:
+        return np.random.default_rng()
+    return np.random.default_rng([seed, circuit_round])
+
+
+def _points_table(n_drivers: int) -> np.ndarray:
+    pts_arr = np.zeros(n_drivers, dtype=np.float64)
+    pts_arr[:len(POINTS_SYSTEM)] = POINTS_SYSTEM[:n_drivers]
+    return pts_arr
+
+
+def _simulate_race(
+    circuit: dict,
+    grid: Dict[str, Any],
+    structure: Dict[str, Any],
+    iters: int,
+    car_ratings: Dict[str, float],
+    driver_ratings: Dict[str, float],
+    rng: np.random.Generator,
+    circuit_index: Optional[Dict[str, Any]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched race kernel.
+    Returns (positions, finished), both shape (iters, n_drivers).
+    """
+    base_scores = _build_base_scores(circuit, grid, car_ratings, driver_ratings, circuit_index)
+    scores, dnf = _apply_shocks(base_scores, _draw_shocks(rng, iters, structure), structure)
+    return _rank_positions(scores), ~dnf
+
+
+def _ahead_matrix(key: np.ndarray, chunk: int = 4096) -> np.ndarray:
+    """
+    Fraction of iterations in which driver i has a strictly lower key than driver j.
+    key is (iters, n_drivers): finishing position (DNF = n_drivers) or negated points.
+    """
+    iters, n_drivers = key.shape
+    counts = np.zeros((n_drivers, n_drivers), dtype=np.int64)
+    for start in range(0, iters, chunk):
+        block = key[start:start + chunk]
+        counts += (block[:, :, None] < block[:, None, :]).sum(axis=0)
+    return counts / iters
+
+
+def _h2h_payload(matrix: np.ndarray, codes: List[str]) -> Dict[str, Any]:
+    return {
+        "drivers": list(codes),
+        "matrix": np.round(matrix * 100, 2).tolist(),  # [i][j] = % i finishes ahead of j
+    }
+
+
+def _driver_results(
+    pos_prob: np.ndarray,
+    win_p: np.ndarray,
+    podium_p: np.ndarray,
+    win_se: np.ndarray,
+    podium_se: np.ndarray,
+    avg_points: np.ndarray,
+    car_ratings: Dict[str, float],
+    driver_ratings: Dict[str, float],
+    grid: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Per-driver result rows sorted by win_pct; pos_prob[driver, pos] = P(classified in pos)."""
+    data = load_season(grid["season"])
+    n_drivers = len(grid["codes"])
     results = []
-    for i, code in enumerate(DRIVER_CODES):
-        info = GRID_2026[code]
-        team = info["team"]
-        team_color = TEAMS_2026[team]["color"]
-
-        win_pct = wins[i] / iters * 100
-        podium_pct = podiums[i] / iters * 100
-        avg_points = total_points[i] / iters
-
-        # Expected position: weighted mean of pos_dist
-        pos_counts = pos_dist[i]
-        total_finishes = pos_counts.sum()
-        if total_finishes > 0:
-            expected_pos = float(np.sum(pos_counts * np.arange(1, n_drivers + 1)) / total_finishes)
+    for i, (code, team) in enumerate(grid["entries"]):
+        info = data["drivers"][code]
+        team_info = data["teams"][team]
+
+        # Expected position: weighted mean of pos_prob over classified finishes
+        finish_p = pos_prob[i].sum()
+        if finish_p > 0:
+            expected_pos = float(np.sum(pos_prob[i] * np.arange(1, n_drivers + 1)) / finish_p)
         else:
             expected_pos = float(n_drivers)
 
         # Position distribution (P1-P12 for display)
         pos_distribution = [
-            {"pos": p + 1, "pct": round(pos_dist[i, p] / iters * 100, 2)}
+            {"pos": p + 1, "pct": round(float(pos_prob[i, p]) * 100, 2)}
             for p in range(min(12, n_drivers))
         ]
 
@@ -155,13 +600,15 @@ def run_race_simulation(
             "code": code,
             "name": info["name"],
             "number": info["number"],
-            "team": team,
-            "team_color": team_color,
+            "team": team_info["name"],
+            "team_color": team_info["color"],
             "rookie": info["rookie"],
             "new_team": info["new_team"],
-            "win_pct": round(win_pct, 2),
-            "podium_pct": round(podium_pct, 2),
-            "avg_points": round(avg_points, 2),
+            "win_pct": round(float(win_p[i]) * 100, 2),
+            "podium_pct": round(float(podium_p[i]) * 100, 2),
+            "win_se": round(float(win_se[i]) * 100, 3),
+            "podium_se": round(float(podium_se[i]) * 100, 3),
+            "avg_points": round(float(avg_points[i]), 2),
             "expected_pos": round(expected_pos, 2),
             "pos_distribution": pos_distribution,
             "driver_rating": round(driver_ratings.get(code, 70.0), 1),
@@ -170,22 +617,141 @@ def run_race_simulation(
 
     # Sort by win_pct desc
     results.sort(key=lambda x: x["win_pct"], reverse=True)
+    return results
 
-    return {
+
+def _new_seed() -> int:
+    return int(np.random.default_rng().integers(2 ** 31))
+
+
+def run_race_simulation(
+    circuit_round: int,
+    iters: int = 8000,
+    car_ratings: Dict[str, float] = None,
+    driver_ratings: Dict[str, float] = None,
+    seed: Optional[int] = None,
+    persist: bool = False,
+    h2h: bool = False,
+    variance_reduction: str = "none",
+    circuit_index: Optional[Dict[str, Any]] = None,
+    season: int = CURRENT_SEASON,
+) -> Dict[str, Any]:
+    """
+    Run Monte Carlo simulation for a specific GP round of a season.
+    Returns full result dict with per-driver statistics, including the
+    standard error of win_pct / podium_pct under the chosen estimator.
+
+    variance_reduction: "none", "antithetic" (mirrored noise pairs), "sobol"
+    (scrambled quasi-Monte Carlo, needs scipy; iterations are rounded down to
+    SOBOL_REPLICATES power-of-two blocks) or "control_variate" (regression on
+    zero-mean score controls).
+
+    circuit_index: optional per-circuit performance multipliers from
+    ratings.get_ratings(); None disables circuit history.
+
+    With h2h=True the result also carries the driver x driver "finishes ahead of"
+    matrix, computed from the same simulated positions (a retirement ranks
+    behind every classified finisher; two retirements rank neither ahead).
+
+    With persist=True the raw finishing positions are written to the outcome
+    store (see outcome_store.py) and the result carries the store key.
+    """
+    from ratings import FALLBACK_CAR_RATINGS, FALLBACK_DRIVER_RATINGS
+
+    if car_ratings is None:
+        car_ratings = FALLBACK_CAR_RATINGS
+    if driver_ratings is None:
+        driver_ratings = FALLBACK_DRIVER_RATINGS
+    if persist and seed is None:
+        seed = _new_seed()
+    if variance_reduction not in VARIANCE_REDUCTION_MODES:
+        raise ValueError(f"Unknown variance_reduction {variance_reduction!r}")
+
+    circuit, grid, structure = _race_setup(season, circuit_round)
+
+    n_drivers = len(grid["codes"])
+    pts_arr = _points_table(n_drivers)
+    base_scores = _build_base_scores(circuit, grid, car_ratings, driver_ratings, circuit_index)
+    rng = _make_rng(seed, circuit["round"])
+
+    block = 1
+    if variance_reduction == "antithetic":
+        shocks = _antithetic_shocks(rng, iters, structure)
+        block = 2
+    elif variance_reduction == "sobol":
+        shocks = _sobol_shocks(rng, iters, structure)
+        block = len(shocks["driver_z"]) // SOBOL_REPLICATES
+    else:
+        shocks = _draw_shocks(rng, iters, structure)
+
+    scores, dnf = _apply_shocks(base_scores, shocks, structure)
+    positions, finished = _rank_positions(scores), ~dnf
+    iters = len(positions)
+
+    win_ind = (positions == 0) & finished
+    podium_ind = (positions <= 2) & finished
+    if variance_reduction == "control_variate":
+        controls = _score_controls(base_scores, shocks, dnf, structure)
+        win_p, win_se = _control_variate_estimate(win_ind.astype(np.float64), controls)
+        podium_p, podium_se = _control_variate_estimate(podium_ind.astype(np.float64), controls)
+    else:
+        win_p, win_se = _block_estimate(win_ind.astype(np.float64), block)
+        podium_p, podium_se = _block_estimate(podium_ind.astype(np.float64), block)
+
+    # DNF — no points, no position credit
+    flat = (np.arange(n_drivers) * n_drivers + positions)[finished]
+    pos_dist = np.bincount(flat, minlength=n_drivers * n_drivers).reshape(n_drivers, n_drivers)  # [driver, pos]
+    total_points = np.where(finished, pts_arr[positions], 0.0).sum(axis=0)
+
+    outcomes = None
+    if persist:
+        import outcome_store
+        key = outcome_store.outcome_key(
+            car_ratings, driver_ratings, seed, iters, [circuit["round"]], circuit_index, season,
+            variance_reduction,
+        )
+        writer = outcome_store.open_writer(key, [circuit["round"]], iters, grid["codes"], seed)
+        writer[0] = outcome_store.encode_positions(positions, finished)
+        outcome_store.commit(key, writer)
+        outcomes = {"key": key, "seed": seed}
+
+    results = _driver_results(
+        pos_dist / iters, win_p, podium_p, win_se, podium_se, total_points / iters,
+        car_ratings, driver_ratings, grid,
+    )
+
+    result = {
+        "season": season,
         "circuit": circuit,
         "iterations": iters,
+        "variance_reduction": variance_reduction,
         "results": results,
     }
+    if h2h:
+        result["h2h"] = _h2h_payload(_ahead_matrix(np.where(finished, positions, n_drivers)), grid["codes"])
+    if outcomes:
+        result["outcomes"] = outcomes
+    return result
 
 
 def run_championship_simulation(
     iters: int = 500,
     car_ratings: Dict[str, float] = None,
     driver_ratings: Dict[str, float] = None,
+    seed: Optional[int] = None,
+    persist: bool = False,
+    h2h: bool = False,
+    circuit_index: Optional[Dict[str, Any]] = None,
+    season: int = CURRENT_SEASON,
 ) -> Dict[str, Any]:
     """
-    Simulate all 24 GPs and project championship standings.
+    Simulate every GP of a season and project championship standings.
     Uses fewer iterations (default 500) for speed.
+    Drivers are credited only for the rounds they enter (see data.season_entries),
+    and constructors for the cars they ran in each round.
+    With persist=True every round's finishing positions are stored, shape
+    (rounds, iters, season drivers); rounds a driver did not enter read as DNF.
+    With h2h=True the result carries the matrix of P(i scores more season points than j).
     """
     from ratings import FALLBACK_CAR_RATINGS, FALLBACK_DRIVER_RATINGS
 
@@ -193,59 +759,81 @@ def run_championship_simulation(
         car_ratings = FALLBACK_CAR_RATINGS
     if driver_ratings is None:
         driver_ratings = FALLBACK_DRIVER_RATINGS
+    if persist and seed is None:
+        seed = _new_seed()
+
+    data = load_season(season)
+    codes = data["driver_codes"]
+    column = {code: i for i, code in enumerate(codes)}
+    season_pts = np.zeros((iters, len(codes)), dtype=np.float64)
+    team_pts: Dict[str, float] = dict.fromkeys(data["teams"], 0.0)
+
+    writer = key = None
+    if persist:
+        import outcome_store
+        rounds = [c["round"] for c in data["circuits"]]
+        key = outcome_store.outcome_key(car_ratings, driver_ratings, seed, iters, rounds, circuit_index, season)
+        writer = outcome_store.open_writer(key, rounds, iters, codes, seed)
+
+    for r, circuit in enumerate(data["circuits"]):
+        _, grid, structure = _race_setup(season, circuit["round"])
+        positions, finished = _simulate_race(
+            circuit, grid, structure, iters, car_ratings, driver_ratings,
+            _make_rng(seed, circuit["round"]), circuit_index,
+        )
+        race_pts = np.where(finished, _points_table(len(grid["codes"]))[positions], 0.0)
+        cols = [column[code] for code in grid["codes"]]
+        season_pts[:, cols] += race_pts
+        for (_, team), pts in zip(grid["entries"], race_pts.mean(axis=0)):
+            team_pts[team] += pts
+        if writer is not None:
+            writer[r] = outcome_store.DNF_CODE
+            writer[r][:, cols] = outcome_store.encode_positions(positions, finished)
 
-    n_drivers = len(DRIVER_CODES)
-    total_pts = np.zeros(n_drivers, dtype=np.float64)
+    if writer is not None:
+        outcome_store.commit(key, writer)
 
-    for circuit in CIRCUITS:
-        race_result = run_race_simulation(
-            circuit_round=circuit["round"],
-            iters=iters,
-            car_ratings=car_ratings,
-            driver_ratings=driver_ratings,
-        )
-        for r in race_result["results"]:
-            idx = DRIVER_CODES.index(r["code"])
-            total_pts[idx] += r["avg_points"]
+    total_pts = season_pts.mean(axis=0)
 
     # Driver standings
     driver_standings = []
-    for i, code in enumerate(DRIVER_CODES):
-        info = GRID_2026[code]
-        team = info["team"]
+    for i, code in enumerate(codes):
+        info = data["drivers"][code]
+        team_info = data["teams"][info["team"]]
         driver_standings.append({
             "code": code,
             "name": info["name"],
             "number": info["number"],
-            "team": team,
-            "team_color": TEAMS_2026[team]["color"],
+            "team": team_info["name"],
+            "team_color": team_info["color"],
             "projected_pts": round(float(total_pts[i]), 1),
         })
 
     driver_standings.sort(key=lambda x: x["projected_pts"], reverse=True)
 
     # Constructor standings
-    constructor_totals: Dict[str, float] = {}
-    for i, code in enumerate(DRIVER_CODES):
-        team = GRID_2026[code]["team"]
-        constructor_totals[team] = constructor_totals.get(team, 0.0) + total_pts[i]
-
     constructor_standings = [
         {
-            "team": team,
-            "team_color": TEAMS_2026[team]["color"],
-            "engine": TEAMS_2026[team]["engine"],
-            "total_pts": round(pts, 1),
+            "team": data["teams"][team]["name"],
+            "team_color": data["teams"][team]["color"],
+            "engine": data["teams"][team]["engine"],
+            "total_pts": round(float(pts), 1),
         }
-        for team, pts in sorted(constructor_totals.items(), key=lambda x: -x[1])
+        for team, pts in sorted(team_pts.items(), key=lambda x: -x[1])
     ]
 
-    return {
+    result = {
+        "season": season,
         "standings": driver_standings,
         "constructors": constructor_standings,
         "iterations_per_race": iters,
-        "total_races": len(CIRCUITS),
+        "total_races": len(data["circuits"]),
     }
+    if persist:
+        result["outcomes"] = {"key": key, "seed": seed}
+    if h2h:
+        result["h2h"] = _h2h_payload(_ahead_matrix(-season_pts), codes)
+    return result
 
 
 # ──────────────────────────────────────────────
@@ -257,9 +845,12 @@ def backtest_model(
     car_ratings: Dict[str, float],
     driver_ratings: Dict[str, float],
     iters: int = 2000,
+    season: int = 2024,
 ) -> Dict[str, Any]:
     """
-    Validate model against 2024 historical results.
+    Validate model against a past season's results (default 2024).
+    Each round is simulated at that season's circuit with the field that
+    actually raced it, so every classified driver is scored.
     Computes top-3 hit rate, Brier score for podium probability, rank correlation.
     
     Returns validation metrics to guard against overfitting.
@@ -279,6 +870,8 @@ def backtest_model(
     brier_count = 0
     spearman_corrs = []
     total_races = 0
+    drivers_scored = 0
+    drivers_total = 0
 
     for rnd, results in list(by_round.items())[:20]:  # Cap at 20 for speed
         # Build actual finish dict
@@ -295,12 +888,15 @@ def backtest_model(
                 iters=iters,
                 car_ratings=car_ratings,
                 driver_ratings=driver_ratings,
+                season=season,
             )
         except Exception:
             continue
 
         # Map to predicted rankings by win_pct
         pred_order = [r["code"] for r in sim["results"]]
+        drivers_scored += len(actual.keys() & set(pred_order))
+        drivers_total += len(actual)
 
         # P1 hit rate
         predicted_winner = pred_order[0]
@@ -340,7 +936,9 @@ def backtest_model(
     brier_score = brier_sum / brier_count if brier_count > 0 else 1.0
 
     return {
+        "season": season,
         "total_races_tested": total_races,
+        "driver_coverage_pct": round(drivers_scored / drivers_total * 100, 1),
         "p1_hit_rate": round(hit_p1 / total_races * 100, 1),
         "top3_overlap_per_race": round(hit_p3 / total_races, 2),
         "brier_score_podium": round(brier_score, 4),
@@ -0,0 +1,103 @@
+"""
+offload.py — Bounded executor for CPU-bound simulation work.
+
+Endpoints hand simulation calls to run_cpu(), which
+  • runs them on a shared thread pool so the event loop keeps serving requests,
+  • coalesces identical concurrent requests onto one in-flight computation,
+  • caps concurrency per lane and answers 429 once the lane's queue is full.
+"""
+
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import HTTPException
+
+MAX_WORKERS = int(os.getenv("SIM_MAX_WORKERS", "4"))
+RETRY_AFTER_SECONDS = 2
+
+# lane -> (max concurrent computations, max queued computations)
+LANE_LIMITS: Dict[str, Tuple[int, int]] = {
+    "race":         (2, 8),
+    "championship": (1, 4),
+    "backtest":     (1, 1),
+}
+
+
+class _Lane:
+    def __init__(self, name: str, concurrency: int, queue_depth: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_depth = queue_depth
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.pending = 0  # running + queued computations
+        self.coalesced = 0
+        self.rejected = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.pending,
+            "concurrency": self.concurrency,
+            "queue_depth": self.queue_depth,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+        }
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lanes: Dict[str, _Lane] = {name: _Lane(name, *limits) for name, limits in LANE_LIMITS.items()}
+_inflight: Dict[Tuple[str, Hashable], "asyncio.Task"] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="sim")
+    return _executor
+
+
+async def _compute(lane: _Lane, fn: Callable[..., Any]) -> Any:
+    async with lane.semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn)
+
+
+async def run_cpu(lane: str, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run fn(*args, **kwargs) off the event loop.
+    Requests with the same (lane, key) while one is in flight share its result.
+    Raises HTTPException(429) when the lane is saturated.
+    """
+    inflight_key = (lane, key)
+    task = _inflight.get(inflight_key)
+    if task is not None:
+        _lanes[lane].coalesced += 1
+    else:
+        l = _lanes[lane]
+        if l.pending >= l.concurrency + l.queue_depth:
+            l.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail=f"Simulation queue '{lane}' is full ({l.pending} pending), retry shortly",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+        l.pending += 1
+        task = asyncio.ensure_future(_compute(l, partial(fn, *args, **kwargs)))
+        _inflight[inflight_key] = task
+
+        def _done(t: "asyncio.Task") -> None:
+            l.pending -= 1
+            _inflight.pop(inflight_key, None)
+            if not t.cancelled():
+                t.exception()  # mark retrieved; waiters re-raise it themselves
+
+        task.add_done_callback(_done)
+
+    # shield: a disconnecting client must not cancel a computation others are waiting on
+    return await asyncio.shield(task)
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    return {name: lane.stats() for name, lane in _lanes.items()}
@@ -0,0 +1,210 @@
+"""
+outcome_store.py — Memory-mapped store of raw Monte Carlo outcomes.
+
+Each persisted run is a uint8 array of shape (rounds, iters, drivers): the zero-based
+finishing position of every driver (season driver order, listed in the run's
+metadata), DNF_CODE for retirements and for rounds a driver did not enter.
+20,000 iterations x 24 rounds is ~10 MB, so new questions (teammate battles,
+"P(NOR ahead of VER)", points margins) are answered from disk without re-simulating.
+
+Files are keyed by ratings fingerprint + season + seed + iterations + rounds, plus
+the variance-reduction mode for anything other than plain sampling (a seeded
+antithetic run draws different outcomes than a plain one).
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from typing import Dict, List, Any, Optional
+
+from data import POINTS_SYSTEM, CURRENT_SEASON
+
+STORE_DIR = os.getenv("F1_OUTCOME_STORE_DIR", os.path.join(tempfile.gettempdir(), "f1_outcomes"))
+DNF_CODE = 255
+
+
+# ──────────────────────────────────────────────
+#  Keys
+# ──────────────────────────────────────────────
+def ratings_fingerprint(
+    car_ratings: Dict[str, float],
+    driver_ratings: Dict[str, float],
+    circuit_index: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Stable short hash of a ratings snapshot (including the circuit index, if any)."""
+    payload = json.dumps({"car": car_ratings, "driver": driver_ratings}, sort_keys=True)
+    digest = hashlib.sha1(payload.encode())
+    if circuit_index is not None:
+        digest.update(np.ascontiguousarray(circuit_index["driver"]).tobytes())
+        digest.update(np.ascontiguousarray(circuit_index["team"]).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def outcome_key(
+    car_ratings: Dict[str, float],
+    driver_ratings: Dict[str, float],
+    seed: int,
+    iters: int,
+    rounds: List[int],
+    circuit_index: Optional[Dict[str, Any]] = None,
+    season: int = CURRENT_SEASON,
+    variance_reduction: str = "none",
+) -> str:
+    scope = f"r{rounds[0]}" if len(rounds) == 1 else f"season{len(rounds)}"
+    key = f"{ratings_fingerprint(car_ratings, driver_ratings, circuit_index)}_y{season}_s{seed}_i{iters}_{scope}"
+    return key if variance_reduction == "none" else f"{key}_vr{variance_reduction}"
+
+
+def _paths(key: str) -> Dict[str, str]:
+    base = os.path.join(STORE_DIR, key)
+    return {"data": base + ".npy", "meta": base + ".json"}
+
+
+# ──────────────────────────────────────────────
+#  Writing
+# ──────────────────────────────────────────────
+def encode_positions(positions: np.ndarray, finished: np.ndarray) -> np.ndarray:
+    """(iters, 22) positions + finished mask → uint8 with DNF_CODE for retirements."""
+    return np.where(finished, positions, DNF_CODE).astype(np.uint8)
+
+
+def open_writer(key: str, rounds: List[int], iters: int, driver_codes: List[str], seed: int) -> np.ndarray:
+    """
+    Create a writable memory-mapped array for a run. Callers fill it round by
+    round and then call commit(); readers never see a partially written file.
+    Each writer gets its own temp files, so concurrent runs of the same key
+    cannot clobber each other; the last commit wins.
+    """
+    os.makedirs(STORE_DIR, exist_ok=True)
+    fd, data_tmp = tempfile.mkstemp(prefix=key + ".", suffix=".npy.tmp", dir=STORE_DIR)
+    os.close(fd)
+    with open(_meta_tmp(data_tmp), "w") as f:
+        json.dump({
+            "key": key,
+            "seed": seed,
+            "iters": iters,
+            "rounds": rounds,
+            "driver_codes": list(driver_codes),
+        }, f)
+    return np.lib.format.open_memmap(
+        data_tmp, mode="w+", dtype=np.uint8,
+        shape=(len(rounds), iters, len(driver_codes)),
+    )
+
+
+def _meta_tmp(data_tmp: str) -> str:
+    """Metadata temp file paired with a writer's (unique) data temp file."""
+    return data_tmp[:-len(".npy.tmp")] + ".json.tmp"
+
+
+def commit(key: str, writer: np.ndarray) -> None:
+    writer.flush()
+    data_tmp = writer.filename
+    del writer
+    paths = _paths(key)
+    os.replace(data_tmp, paths["data"])
+    os.replace(_meta_tmp(data_tmp), paths["meta"])
+
+
+def list_outcomes(fingerprint: Optional[str] = None) -> List[str]:
+    """Keys of all committed runs, optionally filtered by ratings fingerprint."""
+    if not os.path.isdir(STORE_DIR):
+        return []
+    keys = [f[:-5] for f in os.listdir(STORE_DIR) if f.endswith(".json")]
+    if fingerprint:
+        keys = [k for k in keys if k.startswith(fingerprint + "_")]
+    return sorted(keys)
+
+
+# ──────────────────────────────────────────────
+#  Querying
+# ──────────────────────────────────────────────
+class OutcomeStore:
+    """
+    Read-only view over one persisted run.
+
+    Event helpers return boolean masks shaped (iters,) for a single round, or
+    (rounds, iters) when rnd is None, so they can be combined with & / | / ~
+    and passed to prob() for arbitrary joint and conditional probabilities.
+    """
+
+    def __init__(self, key: str):
+        paths = _paths(key)
+        if not os.path.exists(paths["meta"]):
+            raise KeyError(f"No stored outcomes for key {key!r}")
+        with open(paths["meta"]) as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        self.key = key
+        self.rounds: List[int] = self.meta["rounds"]
+        self.driver_codes: List[str] = self.meta["driver_codes"]
+        self.iters: int = self.meta["iters"]
+        self.data = np.load(paths["data"], mmap_mode="r")
+
+    def _driver(self, code: str) -> int:
+        try:
+            return self.driver_codes.index(code)
+        except ValueError:
+            raise KeyError(f"Unknown driver code {code!r}")
+
+    def positions(self, rnd: Optional[int] = None) -> np.ndarray:
+        """Raw uint8 positions, (iters, drivers) for one round or (rounds, iters, drivers)."""
+        if rnd is None:
+            return self.data
+        try:
+            return self.data[self.rounds.index(rnd)]
+        except ValueError:
+            raise KeyError(f"Round {rnd} not in stored run {self.key!r}")
+
+    # Events
+    def finished(self, code: str, rnd: Optional[int] = None) -> np.ndarray:
+        return self.positions(rnd)[..., self._driver(code)] != DNF_CODE
+
+    def finishes_within(self, code: str, pos: int, rnd: Optional[int] = None) -> np.ndarray:
+        """Driver classified in P1..P<pos>."""
+        return self.positions(rnd)[..., self._driver(code)] < pos
+
+    def ahead(self, a: str, b: str, rnd: Optional[int] = None) -> np.ndarray:
+        """a is classified ahead of b (b retiring counts, both retiring does not)."""
+        pos = self.positions(rnd)
+        pa = pos[..., self._driver(a)]
+        return (pa != DNF_CODE) & (pa < pos[..., self._driver(b)])
+
+    # Probabilities
+    @staticmethod
+    def prob(event: np.ndarray, given: Optional[np.ndarray] = None) -> float:
+        """P(event) or P(event | given) as a fraction."""
+        if given is None:
+            return float(np.mean(event))
+        n_given = int(np.count_nonzero(given))
+        if n_given == 0:
+            return float("nan")
+        return float(np.count_nonzero(event & given) / n_given)
+
+    def p_ahead(self, a: str, b: str, rnd: Optional[int] = None) -> float:
+        return self.prob(self.ahead(a, b, rnd))
+
+    # Points
+    def points(self) -> np.ndarray:
+        """Per-iteration points for every driver summed over stored rounds, (iters, drivers)."""
+        pts_arr = np.zeros(256, dtype=np.float64)
+        pts_arr[:len(POINTS_SYSTEM)] = POINTS_SYSTEM
+        pts = np.zeros((self.iters, len(self.driver_codes)), dtype=np.float64)
+        for r in range(len(self.rounds)):
+            pts += pts_arr[self.data[r]]
+        return pts
+
+    def points_margin(self, a: str, b: str) -> Dict[str, Any]:
+        """Distribution of points(a) - points(b) over the stored rounds."""
+        pts = self.points()
+        margin = pts[:, self._driver(a)] - pts[:, self._driver(b)]
+        q = np.percentile(margin, [5, 25, 50, 75, 95])
+        return {
+            "a": a,
+            "b": b,
+            "mean": round(float(margin.mean()), 2),
+            "std": round(float(margin.std()), 2),
+            "p_a_ahead": round(float(np.mean(margin > 0)) * 100, 2),
+            "percentiles": {p: round(float(v), 1) for p, v in zip((5, 25, 50, 75, 95), q)},
+        }
@@ -0,0 +1,225 @@
+"""
+precompute.py — Offline bulk precomputation of forecasts.
+
+Runs every round plus the championship for one ratings snapshot and seed across
+all cores, and writes static files that mirror the API paths so the frontend can
+serve them from the CDN (see VITE_STATIC_DATA_URL in frontend/src/api/client.js):
+
+    <out>/race/<round>.json          ← GET /api/race/<round>
+    <out>/race/<round>/h2h.json      ← GET /api/race/<round>/h2h        (--h2h)
+    <out>/championship.json          ← GET /api/championship
+    <out>/championship/h2h.json      ← GET /api/championship/h2h        (--h2h)
+    <out>/circuits.json, ratings.json, manifest.json
+
+Usage:
+    python precompute.py --seed 2026 --out ../frontend/public/data
+    python precompute.py --ratings snapshot.json --format both --h2h
+    python precompute.py --season 2025 --out ./replay-2025
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Tuple
+
+_api_dir = os.path.dirname(os.path.abspath(__file__))
+if _api_dir not in sys.path:
+    sys.path.insert(0, _api_dir)
+
+from data import CURRENT_SEASON, load_season
+
+DEFAULT_OUT = os.path.join(_api_dir, "..", "frontend", "public", "data")
+
+
+# ──────────────────────────────────────────────
+#  Ratings snapshot
+# ──────────────────────────────────────────────
+def load_ratings(path: str = None) -> Tuple[Dict[str, Any], bool]:
+    """
+    Load a ratings snapshot (e.g. a saved /api/ratings response) or fetch live
+    ones. Returns (ratings, degraded); degraded is True when they were built
+    from stale or missing Jolpica data.
+    """
+    from ratings import get_ratings, circuit_index_from_json
+
+    if path:
+        with open(path) as f:
+            snapshot = json.load(f)
+        return {
+            "car_ratings": snapshot["car_ratings"],
+            "driver_ratings": snapshot["driver_ratings"],
+            "circuit_index": circuit_index_from_json(snapshot.get("circuit_index")),
+        }, bool(snapshot.get("degraded", False))
+    data = asyncio.run(get_ratings())
+    return {
+        "car_ratings": data["car_ratings"],
+        "driver_ratings": data["driver_ratings"],
+        "circuit_index": data.get("circuit_index"),
+    }, data["degraded"]
+
+
+# ──────────────────────────────────────────────
+#  Jobs (run in worker processes)
+# ──────────────────────────────────────────────
+def _run_job(job: Tuple[str, int], ratings: Dict[str, Any], opts: Dict[str, Any]) -> Tuple[Tuple[str, int], Dict]:
+    from monte_carlo import run_race_simulation, run_championship_simulation
+
+    kind, gp_round = job
+    if kind == "race":
+        result = run_race_simulation(
+            circuit_round=gp_round,
+            iters=opts["iters"],
+            seed=opts["seed"],
+            h2h=opts["h2h"],
+            season=opts["season"],
+            **ratings,
+        )
+    else:
+        result = run_championship_simulation(
+            iters=opts["champ_iters"],
+            seed=opts["seed"],
+            h2h=opts["h2h"],
+            season=opts["season"],
+            **ratings,
+        )
+    return job, result
+
+
+def run_all(ratings: Dict[str, Any], opts: Dict[str, Any], workers: int = None) -> Dict[Tuple[str, int], Dict]:
+    circuits = load_season(opts["season"])["circuits"]
+    jobs: List[Tuple[str, int]] = [("championship", 0)] + [("race", c["round"]) for c in circuits]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(_run_job, job, ratings, opts) for job in jobs]
+        return dict(f.result() for f in futures)
+
+
+# ──────────────────────────────────────────────
+#  Writers
+# ──────────────────────────────────────────────
+def _write_json(out_dir: str, rel_path: str, payload: Any) -> None:
+    path = os.path.join(out_dir, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, separators=(",", ":"))
+
+
+def write_json(out_dir: str, results: Dict[Tuple[str, int], Dict]) -> None:
+    for (kind, gp_round), full in results.items():
+        h2h = full.get("h2h")
+        result = {k: v for k, v in full.items() if k != "h2h"}
+        if kind == "race":
+            _write_json(out_dir, f"race/{gp_round}.json", result)
+            if h2h:
+                _write_json(out_dir, f"race/{gp_round}/h2h.json", {
+                    "circuit": result["circuit"],
+                    "iterations": result["iterations"],
+                    **h2h,
+                })
+        else:
+            _write_json(out_dir, "championship.json", result)
+            if h2h:
+                _write_json(out_dir, "championship/h2h.json", {
+                    "iterations_per_race": result["iterations_per_race"],
+                    "total_races": result["total_races"],
+                    **h2h,
+                })
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Parquet output requires pyarrow: pip install pyarrow")
+    return pyarrow, pyarrow.parquet
+
+
+def write_parquet(out_dir: str, results: Dict[Tuple[str, int], Dict]) -> None:
+    """Flat per-driver tables: races.parquet and championship.parquet (requires pyarrow)."""
+    pa, pq = _require_pyarrow()
+
+    race_rows = []
+    champ_rows = []
+    for (kind, gp_round), result in results.items():
+        if kind == "race":
+            for r in result["results"]:
+                race_rows.append({
+                    "round": gp_round,
+                    "circuit": result["circuit"]["name"],
+                    **{k: r[k] for k in ("code", "team", "win_pct", "podium_pct", "avg_points", "expected_pos")},
+                })
+        else:
+            champ_rows = [
+                {k: s[k] for k in ("code", "team", "projected_pts")}
+                for s in result["standings"]
+            ]
+
+    os.makedirs(out_dir, exist_ok=True)
+    race_rows.sort(key=lambda r: (r["round"], -r["win_pct"]))
+    pq.write_table(pa.Table.from_pylist(race_rows), os.path.join(out_dir, "races.parquet"))
+    pq.write_table(pa.Table.from_pylist(champ_rows), os.path.join(out_dir, "championship.parquet"))
+
+
+# ──────────────────────────────────────────────
+#  CLI
+# ──────────────────────────────────────────────
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Precompute F1 forecasts as static files")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output directory (default: frontend/public/data)")
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--season", type=int, default=CURRENT_SEASON, help="season data file to simulate (seasons/<year>.json)")
+    parser.add_argument("--iters", type=int, default=8000, help="iterations per race forecast")
+    parser.add_argument("--champ-iters", type=int, default=500, help="iterations per race in the championship run")
+    parser.add_argument("--ratings", help="ratings snapshot JSON (default: fetch live ratings)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--format", choices=("json", "parquet", "both"), default="json")
+    parser.add_argument("--h2h", action="store_true", help="also write head-to-head matrices")
+    args = parser.parse_args(argv)
+
+    from outcome_store import ratings_fingerprint
+
+    if args.format in ("parquet", "both"):
+        _require_pyarrow()  # fail before spending minutes simulating
+
+    try:
+        circuits = load_season(args.season)["circuits"]
+    except KeyError as exc:
+        raise SystemExit(str(exc))
+
+    started = time.time()
+    ratings, degraded = load_ratings(args.ratings)
+    if degraded:
+        print("[precompute] WARNING: ratings were built from stale or missing Jolpica data")
+    opts = {
+        "iters": args.iters, "champ_iters": args.champ_iters, "seed": args.seed,
+        "h2h": args.h2h, "season": args.season,
+    }
+    results = run_all(ratings, opts, args.workers)
+
+    if args.format in ("json", "both"):
+        write_json(args.out, results)
+        _write_json(args.out, "circuits.json", {"season": args.season, "circuits": circuits})
+        from ratings import circuit_index_to_json
+        _write_json(args.out, "ratings.json", {**ratings, "circuit_index": circuit_index_to_json(ratings["circuit_index"])})
+    if args.format in ("parquet", "both"):
+        write_parquet(args.out, results)
+
+    _write_json(args.out, "manifest.json", {
+        "season": args.season,
+        "seed": args.seed,
+        "iters": args.iters,
+        "champ_iters": args.champ_iters,
+        "ratings_fingerprint": ratings_fingerprint(**ratings),
+        "degraded": degraded,
+        "generated_at": int(time.time()),
+        "rounds": [c["round"] for c in circuits],
+    })
+    print(f"[precompute] {len(results)} forecasts → {os.path.abspath(args.out)} in {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,17 @@ ratings.py — Empirical driver & car rating calculation from Jolpica data.
 
 Car ratings: 2024 constructor standings normalized to 55-97, + qualitative 2026 adjustments
 Driver ratings: 2024(45%) + 2025(55%) weighted results, qualifying deltas, DNF rate
-Cache: 1 hour in-memory
+Circuit index: per-circuit driver/team over-performance from 2023-2025 results
+Cache: 1 hour in-memory (5 minutes when some Jolpica datasets were missing)
 """
 
 import time
 import asyncio
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, Optional
 
-from jolpica import fetch_all_data
-from data import GRID_2026, TEAMS_2026, DRIVER_CODES
+from jolpica import fetch_all_data, upstream_status, DATASET_PATHS
+from data import GRID_2026, TEAMS_2026, DRIVER_CODES, CIRCUITS
 
 # ──────────────────────────────────────────────
 #  FALLBACK hardcoded ratings (used if Jolpica fails)
@@ -66,10 +68,16 @@ FALLBACK_TIRE_DEG: Dict[str, float] = {
 _cache: Dict[str, Any] = {}
 _cache_time: float = 0.0
 CACHE_TTL = 3600  # 1 hour
+DEGRADED_CACHE_TTL = 300  # retry sooner when ratings were built from partial data
+# fetch_all_data datasets that only feed the circuit index, not the ratings themselves
+_HISTORY_ONLY_DATASETS = ("race_results_2023",)
+# Sources that count as fresh data; "stale" (breaker / fallback) and "missing" do not
+_HEALTHY_SOURCES = ("live", "replay")
 
 
 def _is_cache_valid() -> bool:
-    return (time.time() - _cache_time) < CACHE_TTL
+    ttl = DEGRADED_CACHE_TTL if _cache.get("degraded") else CACHE_TTL
+    return (time.time() - _cache_time) < ttl
 
 
 def _normalize(value: float, min_val: float, max_val: float, out_min: float, out_max: float) -> float:
@@ -78,6 +86,30 @@ def _normalize(value: float, min_val: float, max_val: float, out_min: float, out
     return out_min + (value - min_val) / (max_val - min_val) * (out_max - out_min)
 
 
+# Map Jolpica constructor name → our team name (fuzzy)
+_CONSTRUCTOR_ALIAS = {
+    "McLaren":          "McLaren",
+    "Ferrari":          "Ferrari",
+    "Red Bull":         "Red Bull",
+    "Mercedes":         "Mercedes",
+    "Aston Martin":     "Aston Martin",
+    "Williams":         "Williams",
+    "RB":               "Racing Bulls",
+    "Alpine F1 Team":   "Alpine",
+    "Haas F1 Team":     "Haas",
+    "Sauber":           "Audi",          # becomes Audi in 2026
+    "Alfa Romeo":       "Audi",          # Sauber's 2023 entry
+    "AlphaTauri":       "Racing Bulls",
+}
+
+
+def _team_for_constructor(jolpica_name: str) -> Optional[str]:
+    for key, our_name in _CONSTRUCTOR_ALIAS.items():
+        if key.lower() in jolpica_name.lower():
+            return our_name
+    return None
+
+
 # ──────────────────────────────────────────────
 #  Car Ratings
 # ──────────────────────────────────────────────
@@ -86,29 +118,11 @@ def _compute_car_ratings(constructor_standings: list) -> Dict[str, float]:
     Build car ratings from 2024 constructor standings + 2026 qualitative adjustments.
     Output scale: 55-97
     """
-    # Map Jolpica constructor name → our team name (fuzzy)
-    _alias = {
-        "McLaren":          "McLaren",
-        "Ferrari":          "Ferrari",
-        "Red Bull":         "Red Bull",
-        "Mercedes":         "Mercedes",
-        "Aston Martin":     "Aston Martin",
-        "Williams":         "Williams",
-        "RB":               "Racing Bulls",
-        "Alpine F1 Team":   "Alpine",
-        "Haas F1 Team":     "Haas",
-        "Sauber":           "Audi",          # becomes Audi in 2026
-        "AlphaTauri":       "Racing Bulls",
-    }
-
     raw: Dict[str, float] = {}
     for entry in constructor_standings:
-        jolpica_name = entry["Constructor"]["name"]
-        pts = float(entry.get("points", 0))
-        for key, our_name in _alias.items():
-            if key.lower() in jolpica_name.lower():
-                raw[our_name] = pts
-                break
+        our_name = _team_for_constructor(entry["Constructor"]["name"])
+        if our_name:
+            raw[our_name] = float(entry.get("points", 0))
 
     # Fill missing teams with 0
     for team in TEAMS_2026:
@@ -142,6 +156,7 @@ def _compute_driver_ratings(
     Weighted 2024(45%) + 2025(55%) driver rating.
     Formula: 55 + pts_norm*26 + pos_norm*10 + quali_delta*2 - dnf_rate*8
     Output scale: 50-97 (rookies: 68, cap 73)
+    If one season's results are unavailable, the other carries the full weight.
     """
 
     def _aggregate_results(results: list) -> Dict[str, Dict[str, float]]:
@@ -174,6 +189,12 @@ def _compute_driver_ratings(
     q24 = _aggregate_quali(quali_2024 or [])
     q25 = _aggregate_quali(quali_2025 or [])
 
+    w24, w25 = 0.45, 0.55
+    if results_2025 is None and results_2024 is not None:
+        w24, w25 = 1.0, 0.0
+    elif results_2024 is None and results_2025 is not None:
+        w24, w25 = 0.0, 1.0
+
     # Merge weighted
     merged: Dict[str, Dict] = {}
     all_codes = set(list(agg24.keys()) + list(agg25.keys()))
@@ -183,10 +204,10 @@ def _compute_driver_ratings(
         races24 = max(d24["races"], 1)
         races25 = max(d25["races"], 1)
         merged[code] = {
-            "pts_w": (d24["total_pts"] / races24) * 0.45 + (d25["total_pts"] / max(d25["races"], 1)) * 0.55,
-            "avg_pos": (sum(d24["positions"]) / len(d24["positions"]) if d24["positions"] else 15) * 0.45
-                     + (sum(d25["positions"]) / len(d25["positions"]) if d25["positions"] else 15) * 0.55,
-            "dnf_rate": (d24["dnf_count"] / races24) * 0.45 + (d25["dnf_count"] / max(d25["races"], 1)) * 0.55,
+            "pts_w": (d24["total_pts"] / races24) * w24 + (d25["total_pts"] / races25) * w25,
+            "avg_pos": (sum(d24["positions"]) / len(d24["positions"]) if d24["positions"] else 15) * w24
+                     + (sum(d25["positions"]) / len(d25["positions"]) if d25["positions"] else 15) * w25,
+            "dnf_rate": (d24["dnf_count"] / races24) * w24 + (d25["dnf_count"] / races25) * w25,
         }
 
     # Quali delta vs teammate
@@ -233,6 +254,126 @@ def _compute_driver_ratings(
     return driver_ratings
 
 
+# ──────────────────────────────────────────────
+#  Circuit Performance Index
+# ──────────────────────────────────────────────
+CIRCUIT_INDEX_SEASON_WEIGHTS = {2023: 0.20, 2024: 0.35, 2025: 0.45}
+CIRCUIT_INDEX_SHRINKAGE = 0.5   # pseudo-weight pulling sparse histories back to neutral
+CIRCUIT_INDEX_SCALE = 0.004     # score multiplier per position gained vs the season norm
+CIRCUIT_INDEX_MAX_DELTA = 5.0   # positions, so each multiplier stays within ±2%
+
+
+def _compute_circuit_index(results_by_season: Dict[int, list]) -> Dict[str, Any]:
+    """
+    (circuit × driver) and (circuit × team) score multipliers from past seasons.
+    Team delta: the constructor's season-average finish minus its finish at the
+    circuit. Driver delta: the gap to the teammate(s) in that race minus the
+    driver's season-average teammate gap, so the car's form at a track is only
+    counted in the team term and does not follow a driver to a new team.
+    > 0 means over-performance there.
+    Returns {"rounds", "circuit_ids", "drivers", "teams": row/column labels,
+             "driver": float32 (24, 22), "team": float32 (24, 11)}.
+    """
+    teams = list(TEAMS_2026.keys())
+    row_of = {c["circuit_id"]: r for r, c in enumerate(CIRCUITS)}
+    drv_col = {code: i for i, code in enumerate(DRIVER_CODES)}
+
+    drv_sum = np.zeros((len(CIRCUITS), len(DRIVER_CODES)))
+    drv_w = np.zeros_like(drv_sum)
+    team_sum = np.zeros((len(CIRCUITS), len(teams)))
+    team_w = np.zeros_like(team_sum)
+
+    for season, results in results_by_season.items():
+        weight = CIRCUIT_INDEX_SEASON_WEIGHTS.get(season, 0.0)
+        if not results or weight <= 0:
+            continue
+
+        team_of = [_team_for_constructor(r.get("constructor", "")) for r in results]
+        unmapped = [r.get("constructor", "") for r, team in zip(results, team_of) if team is None]
+        if unmapped:
+            print(f"[ratings] circuit index {season}: skipped team term for {len(unmapped)} results "
+                  f"of unmapped constructors {sorted(set(unmapped))}")
+
+        team_avg: Dict[str, list] = {}
+        cars: Dict[tuple, list] = {}  # (round, constructor) -> positions of that car's drivers
+        for r, team in zip(results, team_of):
+            if team is not None:
+                team_avg.setdefault(team, []).append(r["position"])
+            cars.setdefault((r["round"], r.get("constructor", "")), []).append(r["position"])
+
+        # Positions ahead of the teammate(s) in the same car that race
+        gaps = []
+        gap_avg: Dict[str, list] = {}
+        for r in results:
+            same_car = cars[(r["round"], r.get("constructor", ""))]
+            if len(same_car) < 2:
+                gaps.append(None)
+                continue
+            gap = (sum(same_car) - r["position"]) / (len(same_car) - 1) - r["position"]
+            gaps.append(gap)
+            gap_avg.setdefault(r["driverCode"], []).append(gap)
+
+        for r, gap, team in zip(results, gaps, team_of):
+            row = row_of.get(r.get("circuitId"))
+            if row is None:
+                continue
+            code = r["driverCode"]
+            if code in drv_col and gap is not None:
+                season_gaps = gap_avg[code]
+                drv_sum[row, drv_col[code]] += weight * (gap - sum(season_gaps) / len(season_gaps))
+                drv_w[row, drv_col[code]] += weight
+            if team in TEAMS_2026:
+                positions = team_avg[team]
+                col = teams.index(team)
+                # Two cars per race: each contributes half a race of evidence
+                team_sum[row, col] += 0.5 * weight * (sum(positions) / len(positions) - r["position"])
+                team_w[row, col] += 0.5 * weight
+
+    def _to_multiplier(total: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        delta = np.clip(total / (weights + CIRCUIT_INDEX_SHRINKAGE), -CIRCUIT_INDEX_MAX_DELTA, CIRCUIT_INDEX_MAX_DELTA)
+        mult = (1.0 + CIRCUIT_INDEX_SCALE * delta).astype(np.float32)
+        mult.flags.writeable = False
+        return mult
+
+    return {
+        "rounds": [c["round"] for c in CIRCUITS],
+        "circuit_ids": [c["circuit_id"] for c in CIRCUITS],
+        "drivers": list(DRIVER_CODES),
+        "teams": teams,
+        "driver": _to_multiplier(drv_sum, drv_w),
+        "team": _to_multiplier(team_sum, team_w),
+    }
+
+
+def circuit_index_to_json(circuit_index: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if circuit_index is None:
+        return None
+    return {
+        "rounds": circuit_index["rounds"],
+        "circuit_ids": circuit_index["circuit_ids"],
+        "drivers": circuit_index["drivers"],
+        "teams": circuit_index["teams"],
+        "driver": np.round(circuit_index["driver"], 4).tolist(),
+        "team": np.round(circuit_index["team"], 4).tolist(),
+    }
+
+
+def circuit_index_from_json(payload: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Inverse of circuit_index_to_json (e.g. for ratings snapshots saved from /api/ratings)."""
+    if not payload:
+        return None
+    by_round = {c["round"]: c["circuit_id"] for c in CIRCUITS}
+    return {
+        "rounds": payload["rounds"],
+        # Snapshots saved before circuit ids were exported index rows by 2026 round
+        "circuit_ids": payload.get("circuit_ids") or [by_round[r] for r in payload["rounds"]],
+        "drivers": payload.get("drivers", DRIVER_CODES),
+        "teams": payload.get("teams", list(TEAMS_2026.keys())),
+        "driver": np.asarray(payload["driver"], dtype=np.float32),
+        "team": np.asarray(payload["team"], dtype=np.float32),
+    }
+
+
 # ──────────────────────────────────────────────
 #  Public API
 # ──────────────────────────────────────────────
@@ -243,8 +384,19 @@ async def get_ratings() -> Dict[str, Any]:
     if _cache and _is_cache_valid():
         return _cache
 
+    degraded = True
+    circuit_history_missing = True
     try:
         raw = await fetch_all_data()
+        # Any subset of datasets still produces ratings; missing pieces use fallbacks.
+        # Stale copies served by the breaker / fallback count as degraded too.
+        # 2023 results only feed the circuit index, so they are reported separately.
+        sources = upstream_status()["sources"]
+        degraded = any(
+            v is None or sources.get(DATASET_PATHS[k]) not in _HEALTHY_SOURCES
+            for k, v in raw.items() if k not in _HISTORY_ONLY_DATASETS
+        )
+        circuit_history_missing = any(raw.get(k) is None for k in _HISTORY_ONLY_DATASETS)
         cs24 = raw.get("constructor_standings_2024")
         r24 = raw.get("race_results_2024")
         r25 = raw.get("race_results_2025")
@@ -253,6 +405,12 @@ async def get_ratings() -> Dict[str, Any]:
 
         car_ratings = _compute_car_ratings(cs24) if cs24 else FALLBACK_CAR_RATINGS.copy()
         driver_ratings = _compute_driver_ratings(r24, r25, q24, q25)
+        # Built once per refresh; the simulation hot path only indexes into it
+        circuit_index = _compute_circuit_index({
+            2023: raw.get("race_results_2023"),
+            2024: r24,
+            2025: r25,
+        })
 
         # Tire degradation factor: inverse of car rating normalized (lower-rated cars tend to suffer more)
         tire_deg = {
@@ -265,11 +423,16 @@ async def get_ratings() -> Dict[str, Any]:
         car_ratings = FALLBACK_CAR_RATINGS.copy()
         driver_ratings = FALLBACK_DRIVER_RATINGS.copy()
         tire_deg = FALLBACK_TIRE_DEG.copy()
+        circuit_index = None
 
     _cache = {
         "driver_ratings": driver_ratings,
         "car_ratings": car_ratings,
         "tire_deg": tire_deg,
+        "circuit_index": circuit_index,
+        "degraded": degraded,
+        "circuit_history_missing": circuit_history_missing,
+        "upstream": upstream_status(),
     }
     _cache_time = time.time()
     return _cache
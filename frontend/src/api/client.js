@@ -3,9 +3,12 @@
  */
 
 const BASE_URL = import.meta.env.VITE_API_URL || ''
+// Base path of files written by api/precompute.py (e.g. '/data'); when set,
+// forecasts are read from the CDN instead of the Python function.
+const STATIC_DATA_URL = import.meta.env.VITE_STATIC_DATA_URL || ''
 
-async function apiFetch(path, params = {}) {
-    const url = new URL(`${BASE_URL}${path}`, window.location.origin)
+async function apiFetch(path, params = {}, base = BASE_URL) {
+    const url = new URL(`${base}${path}`, window.location.origin)
     Object.entries(params).forEach(([k, v]) => url.searchParams.set(k, v))
     try {
         const res = await fetch(url.toString())
@@ -18,9 +21,19 @@ async function apiFetch(path, params = {}) {
     }
 }
 
+const staticFetch = (path) => apiFetch(`${path}.json`, {}, STATIC_DATA_URL)
+
 export const fetchHealth = () => apiFetch('/api/health')
-export const fetchRatings = () => apiFetch('/api/ratings')
-export const fetchCircuits = () => apiFetch('/api/circuits')
-export const fetchRace = (round, iters = 8000) => apiFetch(`/api/race/${round}`, { iters })
-export const fetchChampionship = (iters = 500) => apiFetch('/api/championship', { iters })
+export const fetchRatings = () =>
+    STATIC_DATA_URL ? staticFetch('/ratings') : apiFetch('/api/ratings')
+export const fetchCircuits = () =>
+    STATIC_DATA_URL ? staticFetch('/circuits') : apiFetch('/api/circuits')
+export const fetchRace = (round, iters = 8000, method = 'monte_carlo') =>
+    STATIC_DATA_URL ? staticFetch(`/race/${round}`) : apiFetch(`/api/race/${round}`, { iters, method })
+export const fetchRaceH2H = (round, iters = 8000) =>
+    STATIC_DATA_URL ? staticFetch(`/race/${round}/h2h`) : apiFetch(`/api/race/${round}/h2h`, { iters })
+export const fetchChampionship = (iters = 500) =>
+    STATIC_DATA_URL ? staticFetch('/championship') : apiFetch('/api/championship', { iters })
+export const fetchChampionshipH2H = (iters = 500) =>
+    STATIC_DATA_URL ? staticFetch('/championship/h2h') : apiFetch('/api/championship/h2h', { iters })
 export const fetchBacktest = (iters = 1000) => apiFetch('/api/backtest', { iters })
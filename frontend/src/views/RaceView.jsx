@@ -134,7 +134,7 @@ export default function RaceView({ selectedRound, onRoundChange, selectedDriver,
         let cancelled = false
         setLoading(true)
         setError(null)
-        fetchRace(selectedRound, 8000).then(({ data, error: err }) => {
+        fetchRace(selectedRound, 8000, 'analytic').then(({ data, error: err }) => {
             if (cancelled) return
             if (err) setError(err)
             else setRaceData(data)
@@ -169,7 +169,9 @@ export default function RaceView({ selectedRound, onRoundChange, selectedDriver,
                         )}
                         {raceData && (
                             <div className="font-rajdhani text-xs text-gray-600">
-                                {raceData.iterations?.toLocaleString()} iter.
+                                {raceData.method === 'analytic'
+                                    ? 'cálculo exacto'
+                                    : `${raceData.iterations?.toLocaleString()} iter.`}
                             </div>
                         )}
                     </div>
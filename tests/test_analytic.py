@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from monte_carlo import run_race_simulation, run_race_analytic
+
+ITERS = 50_000
+MAX_SE = 4.5          # same bar as `python bench.py analytic`
+MAX_H2H_DIFF = 2.0    # percentage points
+
+
+@pytest.mark.parametrize("rnd", [1, 8])
+def test_analytic_matches_monte_carlo(rnd):
+    exact = run_race_analytic(rnd, h2h=True)
+    sim = run_race_simulation(rnd, ITERS, seed=rnd, h2h=True)
+
+    mc = {r["code"]: r for r in sim["results"]}
+    for r in exact["results"]:
+        m = mc[r["code"]]
+        for key, se_key in (("win_pct", "win_se"), ("podium_pct", "podium_se")):
+            z = abs(r[key] - m[key]) / max(m[se_key], 0.01)
+            assert z <= MAX_SE, f"{r['code']} {key}: analytic {r[key]} vs MC {m[key]} ({z:.1f} SE)"
+
+    h2h_diff = np.abs(np.array(exact["h2h"]["matrix"]) - np.array(sim["h2h"]["matrix"]))
+    assert h2h_diff.max() <= MAX_H2H_DIFF
@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+import httpx
+
+import index
+import ratings
+from monte_carlo import _analytic_positions_cached
+
+
+def test_analytic_request_prefills_every_round(monkeypatch):
+    monkeypatch.setattr(ratings, "_cache", {
+        "car_ratings": ratings.FALLBACK_CAR_RATINGS,
+        "driver_ratings": ratings.FALLBACK_DRIVER_RATINGS,
+        "tire_deg": ratings.FALLBACK_TIRE_DEG,
+        "circuit_index": None,
+        "degraded": False,
+    })
+    monkeypatch.setattr(ratings, "_cache_time", time.time())
+    monkeypatch.setattr(index, "_analytic_prefill", {})
+    _analytic_positions_cached.cache_clear()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=index.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/api/race/3", params={"method": "analytic"})
+            resp.raise_for_status()
+            await index._analytic_prefill[index.CURRENT_SEASON][1]
+
+    asyncio.run(scenario())
+    info = _analytic_positions_cached.cache_info()
+    assert info.currsize == len(index.CIRCUITS)
+    assert info.misses == len(index.CIRCUITS)  # the requested round was not computed twice
@@ -0,0 +1,64 @@
+import asyncio
+
+import jolpica
+
+
+def test_deadline_does_not_outlive_fetch_all_data(monkeypatch):
+    calls = []
+
+    async def fake_fetch(url, timeout):
+        calls.append(url)
+        return {"MRData": {}}
+
+    monkeypatch.setattr(jolpica, "_fetch", fake_fetch)
+    monkeypatch.setattr(jolpica, "FIXTURE_MODE", "off")
+    monkeypatch.setattr(jolpica, "_breaker", jolpica._Breaker(1, 60))
+
+    async def scenario():
+        await jolpica.fetch_all_data(deadline=0.05)
+        assert jolpica._deadline.get() is None
+        await asyncio.sleep(0.1)  # the old deadline has now passed
+        return await jolpica._get("/2024/results")
+
+    assert asyncio.run(scenario()) == {"MRData": {}}
+    assert len(calls) == 7
+    assert jolpica._breaker.state == "closed"
+    assert jolpica.upstream_status()["sources"]["/2024/results"] == "live"
+
+
+def test_failed_fetch_never_falls_back_to_fixtures(monkeypatch, tmp_path):
+    async def failing_fetch(url, timeout):
+        raise jolpica.httpx.ConnectError("unreachable")
+
+    (tmp_path / "2024_results.json").write_text('{"MRData": {}}')
+    monkeypatch.setattr(jolpica, "_fetch", failing_fetch)
+    monkeypatch.setattr(jolpica, "FIXTURE_MODE", "off")
+    monkeypatch.setattr(jolpica, "FIXTURE_DIR", str(tmp_path))
+    monkeypatch.setattr(jolpica, "_breaker", jolpica._Breaker(3, 60))
+    monkeypatch.setattr(jolpica, "_last_good", {})
+
+    assert asyncio.run(jolpica._get("/2024/results")) is None
+    assert jolpica.upstream_status()["sources"]["/2024/results"] == "missing"
+
+
+def test_cancelled_probe_does_not_wedge_the_breaker(monkeypatch):
+    async def hanging_fetch(url, timeout):
+        await asyncio.sleep(3600)
+
+    breaker = jolpica._Breaker(1, 0.0)
+    breaker.record_failure()  # open, and half-open immediately (no cool-down)
+    monkeypatch.setattr(jolpica, "_fetch", hanging_fetch)
+    monkeypatch.setattr(jolpica, "FIXTURE_MODE", "off")
+    monkeypatch.setattr(jolpica, "_breaker", breaker)
+
+    async def scenario():
+        probe = asyncio.ensure_future(jolpica._get("/2024/results"))
+        await asyncio.sleep(0.01)
+        assert breaker.probing
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert breaker.state == "half-open"
+    assert not breaker.probing
+    assert breaker.allow()
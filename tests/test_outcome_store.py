@@ -0,0 +1,21 @@
+import numpy as np
+
+import outcome_store
+
+
+def test_concurrent_writers_of_one_key_do_not_share_temp_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(outcome_store, "STORE_DIR", str(tmp_path))
+    key = "abc_y2026_s1_i4_r1"
+    first = outcome_store.open_writer(key, [1], 4, ["NOR", "VER"], 1)
+    second = outcome_store.open_writer(key, [1], 4, ["NOR", "VER"], 1)
+    assert first.filename != second.filename
+
+    first[0] = np.array([[0, 1]] * 4, dtype=np.uint8)
+    second[0] = np.array([[1, 0]] * 4, dtype=np.uint8)
+    outcome_store.commit(key, first)
+    outcome_store.commit(key, second)
+
+    store = outcome_store.OutcomeStore(key)
+    assert store.positions(1)[:, 0].tolist() == [1, 1, 1, 1]
+    assert outcome_store.list_outcomes() == [key]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [key + ".json", key + ".npy"]